@@ -1,9 +1,14 @@
 # core\basic_analyzer.py
 import networkx as nx
-from networkx.algorithms.community import louvain_communities
-import matplotlib.pyplot as plt
+import numpy as np
 import json
 
+from core.community import CommunityEngine, initial_membership, membership_to_sets
+from core.centrality_result import CentralityResult
+from core.graph_views import GraphViews
+from utils.compact_export import write_compact
+from utils.visualizer import plot_community
+
 
 class BasicAnalyzer:
     """
@@ -13,40 +18,159 @@ class BasicAnalyzer:
     3. Modularidad (Comunidades)
     """
 
-    def __init__(self, G):
+    def __init__(self, G, cache=None, attrs=None):
+        """
+        :param G: Grafo de la red.
+        :param cache: ResultCache opcional; los resultados se reutilizan mientras el grafo
+            y los parámetros no cambien.
+        :param attrs: NodeAttributeStore opcional, usado para filtrar centralidades por
+            tipo y plataforma.
+        """
         self.G = G
+        self.cache = cache
+        self.attrs = attrs
 
-    def compute_centralities(self):
-        degree = {
-            k: v
-            for k, v in sorted(
-                nx.degree_centrality(self.G).items(), key=lambda item: item[1], reverse=True
-            )
-            if v > 0
-        }
-        return {'degree': degree}
+    @property
+    def views(self):
+        # Se resuelve en cada acceso: si el grafo cambió, el registro entrega vistas nuevas
+        return GraphViews.of(self.G)
+
+    @property
+    def arrays(self):
+        # Representación en arreglos compartida con el resto de analizadores del mismo grafo
+        return self.views.arrays
+
+    def _cached(self, name, params, compute):
+        if self.cache is None:
+            return compute()
+        return self.cache.cached(self.arrays.fingerprint(), name, params, compute)
+
+    def degree_centrality_array(self):
+        """
+        Centralidad de grado como arreglo NumPy alineado con el arreglo de nodos.
+        :return: (nodos, valores)
+        """
+        return self.arrays.nodes, self.arrays.degree_centrality()
+
+    def centralities(self):
+        """
+        Centralidad de grado como CentralityResult (arreglos alineados con los nodos),
+        p. ej. para consultar result.top_k('degree', 10, tipo='Usuario').
+        """
+        arrays = self.arrays
+        return CentralityResult(
+            arrays.nodes,
+            {'degree': arrays.degree_centrality()},
+            index=arrays.index,
+            attrs=self.attrs,
+            G=self.G,
+        )
+
+    def compute_centralities(self, top_k=10, full=False):
+        """
+        Centralidad de grado de los nodos con valor > 0, ordenada de mayor a menor.
+        Por defecto solo materializa los top_k nodos (selección parcial); con full=True
+        devuelve todos.
+        """
+        result = self.centralities()
+        k = len(result) if full else top_k
+        return {'degree': dict(result.top_k('degree', k, positive=True))}
 
     def compute_density(self):
-        return nx.density(self.G)
+        return self._cached('density', None, lambda: nx.density(self.G))
 
-    def detect_communities(self):
-        if self.G.is_directed():
-            G_undirected = self.G.to_undirected()
-        else:
-            G_undirected = self.G
+    def community_membership(
+        self, resolution=1.0, seed=42, previous=None, changed_nodes=None, reduce=None
+    ):
+        """
+        Partición del grafo (tratado como no dirigido) como arreglo nodo -> comunidad,
+        alineado con self.arrays.nodes.
+        :param previous: Partición previa (lista de conjuntos o dict nodo -> comunidad) usada
+            como punto de partida.
+        :param changed_nodes: Nodos cuyo vecindario cambió desde la partición previa
+            (p. ej. NetworkBuilder.changed_nodes()); solo se reoptimiza su entorno.
+        :param reduce: None, 'leaves' o 'core': detecta sobre el grafo con las hojas (o los
+            árboles colgantes) colapsadas en su vecino, que heredan su comunidad.
+        """
+        reduction = None if reduce is None else self.arrays.reduction(reduce)
+        if previous is None:
+            return self._cached(
+                'communities',
+                {'resolution': resolution, 'seed': seed, 'reduce': reduce},
+                lambda: CommunityEngine(resolution=resolution, seed=seed).fit(
+                    self.arrays.undirected(), reduction=reduction
+                ),
+            )
 
-        communities = louvain_communities(G_undirected)
-        sorted_communities = sorted([c for c in communities if len(c) > 1], key=len, reverse=True)
-        return sorted_communities
+        engine = CommunityEngine(resolution=resolution, seed=seed)
+        initial = initial_membership(self.arrays.index, previous)
+        changed = None
+        if changed_nodes is not None:
+            index = self.arrays.index
+            changed = [index[node] for node in changed_nodes if node in index]
+        membership = engine.fit(
+            self.arrays.undirected(), initial=initial, changed=changed, reduction=reduction
+        )
+        if engine.modularity_delta_ is not None:
+            print(
+                f'Modularidad: {engine.initial_modularity_:.4f} -> {engine.modularity_:.4f} '
+                f'(cambio {engine.modularity_delta_:+.4f})'
+            )
+        return membership
+
+    def detect_communities(
+        self, resolution=1.0, seed=42, previous=None, changed_nodes=None, reduce=None
+    ):
+        membership = self.community_membership(
+            resolution=resolution,
+            seed=seed,
+            previous=previous,
+            changed_nodes=changed_nodes,
+            reduce=reduce,
+        )
+        # Las etiquetas ya vienen ordenadas de la comunidad más grande a la más pequeña
+        return membership_to_sets(self.arrays.nodes, membership, min_size=2)
+
+    def community_levels(self, resolution=1.0, seed=42, reduce=None):
+        """
+        Dendrograma completo de una sola ejecución del motor de comunidades: una
+        partición por nivel de agregación, de la más fina a la final.
+        :return: Lista de arreglos int32 nodo -> comunidad alineados con self.arrays.nodes.
+        """
+
+        def compute():
+            engine = CommunityEngine(resolution=resolution, seed=seed)
+            reduction = None if reduce is None else self.arrays.reduction(reduce)
+            engine.fit(self.arrays.undirected(), reduction=reduction)
+            return engine.levels_
+
+        return self._cached(
+            'community_levels',
+            {'resolution': resolution, 'seed': seed, 'reduce': reduce},
+            compute,
+        )
+
+    def resolution_sweep(self, resolutions=(2.0, 1.0, 0.5), seed=42):
+        """
+        Particiones a varias resoluciones reutilizando los grafos agregados: se recorren
+        de mayor a menor y cada una parte del grafo reducido por la anterior, así que las
+        comunidades quedan anidadas entre escalas.
+        :return: Diccionario resolución -> arreglo nodo -> comunidad.
+        """
+        return self._cached(
+            'resolution_sweep',
+            {'resolutions': sorted(set(resolutions)), 'seed': seed},
+            lambda: CommunityEngine(seed=seed).sweep(self.arrays.undirected(), resolutions),
+        )
 
-    def plot_largest_community(self, communities):
-        subgraph = self.G.subgraph(communities)
-        plt.figure(figsize=(10, 8))
-        nx.draw(
-            subgraph, with_labels=True, node_color='lightblue', node_size=100, edge_color='gray'
+    def plot_largest_community(self, communities, node_budget=300, label_budget=20):
+        plot_community(
+            self.G,
+            communities,
+            title='Comunidad Más Grande',
+            node_budget=node_budget,
+            label_budget=label_budget,
         )
-        plt.title('Comunidad Más Grande')
-        plt.show()
 
     def export_communities_to_json(self, communities, filename='communities.json'):
         """
@@ -64,6 +188,15 @@ class BasicAnalyzer:
 
         print(f'Comunidades exportadas a {filename}')
 
+    def load_communities_from_json(self, filename='communities.json'):
+        """
+        Carga comunidades exportadas con export_communities_to_json (p. ej. para usarlas
+        como partición previa en detect_communities).
+        """
+        with open(filename) as f:
+            data = json.load(f)
+        return [set(nodes) for nodes in data.values()]
+
     def export_centralities_to_json(self, centralities, filename='centralities.json'):
         """
         Exporta las centralidades de los nodos a un archivo JSON.
@@ -77,12 +210,28 @@ class BasicAnalyzer:
 
         print(f'Centralidades exportadas a {filename}')
 
-    def summarize(self):
-        communities = self.detect_communities()
-        centralities = self.compute_centralities()
+    def export_compact(self, path, membership=None, centralities=None):
+        """
+        Exporta comunidades y centralidades en formato compacto (IDs de nodo + arreglos
+        binarios), pensado para grafos completos donde el JSON crece a gigabytes.
+        :param membership: Arreglo nodo -> comunidad alineado con self.arrays.nodes.
+        :param centralities: Diccionario medida -> arreglo alineado con self.arrays.nodes.
+        """
+        write_compact(path, self.arrays.nodes, membership, centralities)
+        print(f'Resultados exportados en formato compacto a {path}')
+
+    def summarize(self, full_export=False, export_format='json', export_path='analysis'):
+        """
+        :param export_format: 'json' (diccionarios, adecuado para resultados pequeños) o
+            'compact' (ver export_compact).
+        """
+        membership = self.community_membership()
+        communities = membership_to_sets(self.arrays.nodes, membership, min_size=2)
+        centralities = self.compute_centralities(full=full_export)
 
         # Contar el total de nodos con centralidad > 0
-        total_central_nodes = sum(len(nodes) for nodes in centralities.values())
+        _, degree_values = self.degree_centrality_array()
+        total_central_nodes = int(np.count_nonzero(degree_values > 0))
 
         ## Titulo Resultados
         print('\nResultados del Análisis Básico:')
@@ -102,8 +251,11 @@ class BasicAnalyzer:
             print(f'La comunidad más grande tiene: {len(largest_community)} nodos.')
             self.plot_largest_community(largest_community)
 
-        self.export_communities_to_json(communities)
-        self.export_centralities_to_json(centralities)
+        if export_format == 'compact':
+            self.export_compact(export_path, membership, {'degree': degree_values})
+        else:
+            self.export_communities_to_json(communities)
+            self.export_centralities_to_json(centralities)
 
         return {
             'Comunidades detectadas': len(communities),
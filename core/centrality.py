@@ -0,0 +1,632 @@
+# core/centrality.py
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import scipy.sparse as sp
+
+# Arreglos CSR adjuntos a la memoria compartida dentro de cada proceso trabajador
+_WORKER_CSR = {}
+
+
+def _share(array):
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[:] = array
+    return shm, (shm.name, array.shape, array.dtype.str)
+
+
+def _attach_csr(indptr_spec, indices_spec):
+    """
+    Inicializador de los trabajadores: abre los bloques de memoria compartida del grafo
+    sin copiarlos.
+    """
+    for key, (name, shape, dtype) in (('indptr', indptr_spec), ('indices', indices_spec)):
+        shm = shared_memory.SharedMemory(name=name)
+        _WORKER_CSR[f'{key}_shm'] = shm
+        _WORKER_CSR[key] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf)
+
+
+def brandes_accumulate(indptr, indices, sources, n):
+    """
+    Acumula las dependencias de Brandes (grafo no ponderado) desde un conjunto de fuentes.
+    Las estructuras por fuente son diccionarios, así que cada BFS solo toca su componente.
+    :return: Arreglo de intermediación sin normalizar.
+    """
+    betweenness = np.zeros(n)
+    for s in sources:
+        s = int(s)
+        stack = []
+        pred = {s: []}
+        sigma = {s: 1}
+        dist = {s: 0}
+        queue = deque([s])
+        while queue:
+            v = queue.popleft()
+            stack.append(v)
+            next_dist = dist[v] + 1
+            sigma_v = sigma[v]
+            for w in indices[indptr[v] : indptr[v + 1]].tolist():
+                if w not in dist:
+                    dist[w] = next_dist
+                    sigma[w] = 0
+                    pred[w] = []
+                    queue.append(w)
+                if dist[w] == next_dist:
+                    sigma[w] += sigma_v
+                    pred[w].append(v)
+
+        delta = dict.fromkeys(stack, 0.0)
+        while stack:
+            w = stack.pop()
+            coeff = (1.0 + delta[w]) / sigma[w]
+            for v in pred[w]:
+                delta[v] += sigma[v] * coeff
+            if w != s:
+                betweenness[w] += delta[w]
+    return betweenness
+
+
+def _worker_brandes(sources, n):
+    return brandes_accumulate(_WORKER_CSR['indptr'], _WORKER_CSR['indices'], sources, n)
+
+
+def sample_paths(indptr, indices, pairs, n, seed):
+    """
+    Para cada par (u, v) hace un BFS desde u que se detiene al extraer v y elige uno de
+    los caminos mínimos u -> v al azar, retrocediendo desde v a cada predecesor z con
+    probabilidad sigma[z] / sigma[t]. Los pares sin camino no aportan nada.
+    :return: Arreglo con las veces que cada nodo fue interno de un camino muestreado.
+    """
+    rng = np.random.default_rng(seed)
+    counts = np.zeros(n)
+    for u, v in pairs.tolist():
+        pred = {u: []}
+        sigma = {u: 1}
+        dist = {u: 0}
+        queue = deque([u])
+        found = False
+        while queue:
+            x = queue.popleft()
+            if x == v:
+                found = True
+                break
+            next_dist = dist[x] + 1
+            sigma_x = sigma[x]
+            for w in indices[indptr[x] : indptr[x + 1]].tolist():
+                if w not in dist:
+                    dist[w] = next_dist
+                    sigma[w] = 0
+                    pred[w] = []
+                    queue.append(w)
+                if dist[w] == next_dist:
+                    sigma[w] += sigma_x
+                    pred[w].append(x)
+        if not found:
+            continue
+
+        t = v
+        while True:
+            candidates = pred[t]
+            z = candidates[0]
+            if len(candidates) > 1:
+                # sigma[t] es la suma de sigma sobre sus predecesores
+                remaining = rng.random() * sigma[t]
+                for z in candidates:
+                    remaining -= sigma[z]
+                    if remaining < 0:
+                        break
+            if z == u:
+                break
+            counts[z] += 1
+            t = z
+    return counts
+
+
+def _worker_paths(task, n):
+    pairs, seed = task
+    return sample_paths(_WORKER_CSR['indptr'], _WORKER_CSR['indices'], pairs, n, seed)
+
+
+class BetweennessEngine:
+    """
+    Intermediación aproximada, repartida entre procesos que comparten el grafo CSR en
+    memoria compartida. Por defecto usa muestreo de pivotes (Brandes desde k fuentes).
+    Con `epsilon` usa el muestreo de caminos de Riondato y Kornaropoulos: el número de
+    caminos se fija de antemano con la cota de dimensión VC,
+    r = (c / epsilon²) (floor(log2(VD - 2)) + 1 + ln(1 / delta)), siendo VD una cota del
+    diámetro en nodos. Así, con probabilidad 1 - delta, el error absoluto de todos los
+    nodos es como mucho epsilon (en la escala n (n - 1); multiplicado por n / (n - 2) en
+    la de networkx).
+    """
+
+    # Constante universal de la cota de Riondato y Kornaropoulos
+    VC_CONSTANT = 0.5
+
+    def __init__(self, k=500, epsilon=None, delta=0.1, chunk_size=25, n_jobs=None, seed=42):
+        """
+        :param k: Pivotes a usar en el muestreo por fuentes (exacta si k >= n).
+        :param epsilon: Error absoluto máximo; si se indica, se muestrean caminos y k no
+            se usa.
+        :param delta: Probabilidad de superar epsilon en el muestreo de caminos.
+        :param chunk_size: Pivotes (o caminos) por tarea enviada a un trabajador.
+        :param n_jobs: Número de procesos (por defecto, todos los núcleos; 1 = sin pool).
+        :param seed: Semilla de la selección de pivotes o pares.
+        """
+        if epsilon is not None and not 0 < epsilon < 1:
+            raise ValueError('epsilon debe estar entre 0 y 1.')
+        if not 0 < delta < 1:
+            raise ValueError('delta debe estar entre 0 y 1.')
+        self.k = k
+        self.epsilon = epsilon
+        self.delta = delta
+        self.chunk_size = chunk_size
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.seed = seed
+        self.pivots_used_ = 0
+        self.samples_ = 0
+        self.vertex_diameter_ = None
+
+    def compute(self, A, normalized=True):
+        """
+        :param A: Matriz CSR de adyacencia (dirigida o simétrica); solo se usa su patrón.
+        :return: Arreglo de intermediación alineado con las filas de A.
+        """
+        n = A.shape[0]
+        indptr = np.ascontiguousarray(A.indptr, dtype=np.int64)
+        indices = np.ascontiguousarray(A.indices, dtype=np.int64)
+        if self.epsilon is not None:
+            return self._sampled_paths(A, indptr, indices, n, normalized)
+
+        pivots = np.random.default_rng(self.seed).permutation(n)[: min(self.k, n)]
+        size = self.chunk_size
+        chunks = [pivots[i : i + size] for i in range(0, len(pivots), size)]
+        totals = np.zeros(n)
+        for partial in self._run(indptr, indices, n, chunks, sampled=False):
+            totals += partial
+        used = self.pivots_used_ = len(pivots)
+        scale = 1.0
+        if normalized and n > 2:
+            scale = 1.0 / ((n - 1) * (n - 2))
+        if used < n and used > 0:
+            scale *= n / used
+        return totals * scale
+
+    def _sampled_paths(self, A, indptr, indices, n, normalized):
+        """
+        Muestreo de caminos: r pares (u, v) distintos al azar y un camino mínimo de cada
+        uno; la fracción de caminos en los que un nodo es interno estima su intermediación.
+        """
+        self.vertex_diameter_ = self._vertex_diameter_bound(A)
+        if n < 3 or self.vertex_diameter_ < 3:
+            self.samples_ = 0
+            return np.zeros(n)
+        r = self.VC_CONSTANT / self.epsilon**2
+        r *= np.floor(np.log2(self.vertex_diameter_ - 2)) + 1 + np.log(1 / self.delta)
+        r = self.samples_ = int(np.ceil(r))
+
+        rng = np.random.default_rng(self.seed)
+        u = rng.integers(0, n, size=r)
+        v = rng.integers(0, n - 1, size=r)
+        v += v >= u
+        pairs = np.column_stack([u, v])
+        size = self.chunk_size
+        chunks = [pairs[i : i + size] for i in range(0, r, size)]
+        seeds = rng.integers(0, 2**32, size=len(chunks))
+        counts = np.zeros(n)
+        for partial in self._run(indptr, indices, n, list(zip(chunks, seeds)), sampled=True):
+            counts += partial
+        # counts / r estima la intermediación dividida entre n (n - 1) pares ordenados
+        scale = n / (n - 2) if normalized else n * (n - 1)
+        return counts / r * scale
+
+    def _run(self, indptr, indices, n, tasks, sampled):
+        """
+        Ejecuta las tareas (bloques de pivotes o de pares) en serie o en el pool de
+        procesos con el grafo en memoria compartida.
+        """
+        if self.n_jobs == 1 or len(tasks) <= 1:
+            if sampled:
+                return [sample_paths(indptr, indices, p, n, seed) for p, seed in tasks]
+            return [brandes_accumulate(indptr, indices, chunk, n) for chunk in tasks]
+
+        shared = [_share(indptr), _share(indices)]
+        try:
+            with ProcessPoolExecutor(
+                max_workers=self.n_jobs,
+                initializer=_attach_csr,
+                initargs=(shared[0][1], shared[1][1]),
+            ) as executor:
+                worker = _worker_paths if sampled else _worker_brandes
+                return list(executor.map(worker, tasks, [n] * len(tasks)))
+        finally:
+            for shm, _ in shared:
+                shm.close()
+                shm.unlink()
+
+    @staticmethod
+    def _vertex_diameter_bound(A):
+        """
+        Cota superior del diámetro en nodos (VD) de cualquier camino mínimo. En grafos no
+        dirigidos, 2 * ecc(r) + 1 desde un nodo r de la componente mayor (el de mayor
+        grado), y el tamaño de las demás componentes; en dirigidos, el tamaño de la
+        componente débil mayor (el grafo no dirigido subyacente no acota los caminos
+        dirigidos).
+        """
+        from scipy.sparse.csgraph import connected_components, shortest_path
+
+        pattern = sp.csr_matrix(A, dtype=np.float64)
+        pattern.setdiag(0)
+        pattern.eliminate_zeros()
+        pattern.data[:] = 1.0
+        if pattern.shape[0] == 0:
+            return 0
+        _, labels = connected_components(pattern, directed=True, connection='weak')
+        sizes = np.bincount(labels)
+        largest = int(np.argmax(sizes))
+        if (pattern != pattern.T).nnz > 0:
+            return int(sizes[largest])
+        degree = np.where(labels == largest, np.diff(pattern.indptr), -1)
+        root = int(np.argmax(degree))
+        distances = shortest_path(pattern, directed=False, unweighted=True, indices=root)
+        eccentricity = int(distances[np.isfinite(distances)].max())
+        others = np.delete(sizes, largest)
+        bound = min(2 * eccentricity + 1, int(sizes[largest]))
+        return max(bound, int(others.max()) if len(others) else 0)
+
+
+def _splitmix64(values, seed):
+    """
+    Hash de 64 bits (splitmix64) vectorizado sobre enteros.
+    """
+    with np.errstate(over='ignore'):
+        z = values.astype(np.uint64) + np.uint64((seed * 0x9E3779B97F4A7C15) % 2**64)
+        z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+        z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+        return z ^ (z >> np.uint64(31))
+
+
+class ClosenessEngine:
+    """
+    Cercanía (y centralidad armónica) sobre la matriz CSR. Para grafos pequeños calcula
+    las distancias exactas por BFS con scipy.sparse.csgraph; para grafos grandes usa
+    contadores HyperLogLog por nodo al estilo HyperBall: en la iteración t cada contador
+    estima cuántos nodos llegan al nodo en a lo sumo t saltos, y de esas cardinalidades
+    salen la suma de distancias y la suma de inversos. Como networkx, en grafos dirigidos
+    se usan las distancias entrantes y la normalización de Wasserman-Faust.
+    """
+
+    def __init__(
+        self, method='auto', precision=8, exact_threshold=5000, max_distance=None, seed=42
+    ):
+        """
+        :param method: 'exact', 'hyperball' o 'auto' (exacto hasta exact_threshold nodos).
+        :param precision: log2 del número de registros por contador; el error relativo de
+            cada cardinalidad es ~1.04 / sqrt(2 ** precision); cada nodo ocupa 2 ** precision
+            bytes por copia de los registros.
+        :param exact_threshold: Tamaño máximo del grafo para el modo exacto en 'auto'.
+        :param max_distance: Número máximo de iteraciones de HyperBall (None = hasta
+            que ningún contador cambie).
+        :param seed: Semilla del hash de los contadores.
+        """
+        if method not in ('auto', 'exact', 'hyperball'):
+            raise ValueError(f'Método de cercanía no soportado: {method}')
+        if not 4 <= precision <= 16:
+            raise ValueError('La precisión debe estar entre 4 y 16.')
+        self.method = method
+        self.precision = precision
+        self.exact_threshold = exact_threshold
+        self.max_distance = max_distance
+        self.seed = seed
+        self.iterations_ = 0
+        self.method_ = None
+
+    def compute(self, A, harmonic=False):
+        """
+        :param A: Matriz CSR de adyacencia (dirigida o simétrica); solo se usa su patrón.
+        :param harmonic: Devuelve la centralidad armónica en lugar de la cercanía.
+        :return: Arreglo alineado con las filas de A.
+        """
+        n = A.shape[0]
+        exact = self.method == 'exact' or (self.method == 'auto' and n <= self.exact_threshold)
+        self.method_ = 'exact' if exact else 'hyperball'
+        if n <= 1:
+            return np.zeros(n)
+        if exact:
+            reached, total, inverse = self._exact_sums(A)
+        else:
+            reached, total, inverse = self._hyperball_sums(A)
+        if harmonic:
+            return inverse
+        closeness = np.zeros(n)
+        valid = total > 0
+        r = reached[valid] - 1
+        closeness[valid] = (r / total[valid]) * (r / (n - 1))
+        return closeness
+
+    def _exact_sums(self, A, block=512):
+        """
+        Distancias entrantes exactas por bloques de nodos (BFS sobre la transpuesta).
+        :return: (nodos que alcanzan a cada nodo incluido él, suma de distancias, suma de inversos)
+        """
+        from scipy.sparse.csgraph import shortest_path
+
+        n = A.shape[0]
+        AT = A.T.tocsr()
+        reached = np.zeros(n)
+        total = np.zeros(n)
+        inverse = np.zeros(n)
+        for start in range(0, n, block):
+            rows = np.arange(start, min(start + block, n))
+            dist = shortest_path(AT, unweighted=True, indices=rows)
+            finite = np.isfinite(dist)
+            dist[~finite] = 0
+            reached[rows] = finite.sum(axis=1)
+            total[rows] = dist.sum(axis=1)
+            with np.errstate(divide='ignore'):
+                inverse[rows] = np.where(dist > 0, 1.0 / dist, 0.0).sum(axis=1)
+        return reached, total, inverse
+
+    def _hyperball_sums(self, A, edge_block=1 << 22):
+        """
+        Iteraciones de HyperBall: registers[v] = max(registers[v], registers[u]) para cada
+        arista u -> v, agrupando las aristas por destino y reduciendo por bloques.
+        """
+        n = A.shape[0]
+        b = self.precision
+        m = 1 << b
+        registers = self._initial_registers(n, b)
+
+        coo = A.tocoo()
+        keep = coo.row != coo.col
+        order = np.argsort(coo.col[keep], kind='stable')
+        src = coo.row[keep][order]
+        dst = coo.col[keep][order]
+        starts = np.flatnonzero(np.r_[True, dst[1:] != dst[:-1]]) if len(dst) else np.array([])
+        targets = dst[starts] if len(dst) else np.array([], dtype=np.int64)
+        bounds = self._edge_blocks(starts, len(dst), max(edge_block // m, 1))
+
+        previous = self._estimate(registers, m)
+        reached = previous.copy()
+        total = np.zeros(n)
+        inverse = np.zeros(n)
+        self.iterations_ = 0
+        while self.max_distance is None or self.iterations_ < self.max_distance:
+            t = self.iterations_ + 1
+            updated = registers.copy()
+            for g0, g1 in bounds:
+                e0 = starts[g0]
+                e1 = starts[g1] if g1 < len(starts) else len(dst)
+                merged = np.maximum.reduceat(registers[src[e0:e1]], starts[g0:g1] - e0, axis=0)
+                rows = targets[g0:g1]
+                updated[rows] = np.maximum(updated[rows], merged)
+            changed = np.any(updated != registers, axis=1)
+            self.iterations_ = t
+            if not changed.any():
+                break
+            registers = updated
+            current = self._estimate(registers, m)
+            # Las cardinalidades estimadas no deben decrecer entre iteraciones
+            current = np.maximum(current, previous)
+            gained = current - previous
+            total += t * gained
+            inverse += gained / t
+            reached = current
+            previous = current
+        return reached, total, inverse
+
+    @staticmethod
+    def _edge_blocks(starts, num_edges, max_edges):
+        """
+        Agrupa los destinos en bloques consecutivos de como mucho max_edges aristas (un
+        destino con más aristas forma su propio bloque).
+        """
+        bounds = []
+        g0 = 0
+        ends = np.r_[starts[1:], num_edges] if len(starts) else np.array([])
+        while g0 < len(starts):
+            g1 = int(np.searchsorted(ends, starts[g0] + max_edges, side='right'))
+            g1 = max(g1, g0 + 1)
+            bounds.append((g0, g1))
+            g0 = g1
+        return bounds
+
+    def _initial_registers(self, n, b):
+        """
+        Cada contador empieza con su propio nodo: un registro (bits bajos del hash) con la
+        posición del primer bit a 1 del resto del hash.
+        """
+        hashes = _splitmix64(np.arange(n), self.seed)
+        bucket = (hashes & np.uint64((1 << b) - 1)).astype(np.int64)
+        rest = hashes >> np.uint64(b)
+        width = 64 - b
+        bit_length = np.zeros(n, dtype=np.int64)
+        nonzero = rest > 0
+        bit_length[nonzero] = np.frexp(rest[nonzero].astype(np.float64))[1]
+        rank = np.minimum(width - bit_length + 1, width + 1)
+        registers = np.zeros((n, 1 << b), dtype=np.uint8)
+        registers[np.arange(n), bucket] = rank
+        return registers
+
+    @staticmethod
+    def _estimate(registers, m, block=1 << 16):
+        """
+        Estimador de HyperLogLog con corrección de rango pequeño (linear counting).
+        """
+        alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(m, 0.7213 / (1 + 1.079 / m))
+        estimate = np.empty(len(registers))
+        for start in range(0, len(registers), block):
+            chunk = registers[start : start + block]
+            raw = alpha * m * m / np.exp2(-chunk.astype(np.float64)).sum(axis=1)
+            zeros = (chunk == 0).sum(axis=1)
+            small = (raw <= 2.5 * m) & (zeros > 0)
+            with np.errstate(divide='ignore'):
+                linear = m * np.log(m / np.maximum(zeros, 1))
+            estimate[start : start + block] = np.where(small, linear, raw)
+        return estimate
+
+
+class SpectralEngine:
+    """
+    Centralidades espectrales (eigenvector, PageRank y Katz) por iteración de potencias
+    con productos matriz-vector de scipy.sparse. Sigue las convenciones de networkx
+    (aristas entrantes, criterio de parada sobre la norma L1 del cambio) y registra el
+    residuo y el tiempo de cada iteración. Si eigenvector o Katz no convergen (p. ej. en
+    un grafo dirigido casi acíclico), se recurre a PageRank, que siempre converge.
+    """
+
+    KINDS = ('eigenvector', 'pagerank', 'katz')
+    # Iteraciones mínimas de la medida de recurso, independientes de max_iter
+    FALLBACK_MAX_ITER = 1000
+
+    def __init__(self, tol=1e-6, max_iter=1000, fallback='pagerank'):
+        """
+        :param tol: Tolerancia por nodo (el cambio L1 total debe bajar de n * tol).
+        :param max_iter: Iteraciones máximas.
+        :param fallback: Medida a usar si la pedida no converge (None = lanzar ValueError).
+            Se calcula con al menos FALLBACK_MAX_ITER iteraciones y no lanza errores.
+        """
+        self.tol = tol
+        self.max_iter = max_iter
+        self.fallback = fallback
+        self._reset()
+
+    def _reset(self):
+        self.kind_ = None
+        self.converged_ = False
+        self.iterations_ = 0
+        self.residuals_ = []
+        self.timings_ = []
+        self.fallback_from_ = None
+
+    def compute(self, A, kind='eigenvector', x0=None, alpha=None, beta=1.0):
+        """
+        :param A: Matriz CSR de adyacencia (fila = origen); se usa A transpuesta.
+        :param kind: 'eigenvector', 'pagerank' o 'katz'.
+        :param x0: Vector inicial (p. ej. el resultado de una ejecución anterior).
+        :param alpha: Amortiguación de PageRank (0.85) o atenuación de Katz (0.1).
+        :param beta: Término constante de Katz.
+        :return: Arreglo alineado con las filas de A.
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f'Centralidad espectral no soportada: {kind}')
+        self._reset()
+        self.kind_ = kind
+        x = self._solve(A, kind, x0, alpha, beta)
+        if self.converged_:
+            return x
+        if self.fallback is None or self.fallback == kind:
+            raise ValueError(f'La centralidad {kind} no convergió en {self.max_iter} iteraciones.')
+
+        residuals, timings = self.residuals_, self.timings_
+        self._reset()
+        self.kind_ = self.fallback
+        # El recurso tiene su propio presupuesto de iteraciones y nunca lanza: si tampoco
+        # converge, se devuelve su último iterado con converged_ = False en la telemetría
+        budget = self.max_iter
+        self.max_iter = max(budget, self.FALLBACK_MAX_ITER)
+        try:
+            x = self._solve(A, self.fallback, None, None, 1.0)
+        finally:
+            self.max_iter = budget
+        self.fallback_from_ = kind
+        self.residuals_ = residuals + self.residuals_
+        self.timings_ = timings + self.timings_
+        return x
+
+    def _solve(self, A, kind, x0, alpha, beta):
+        n = A.shape[0]
+        if n == 0:
+            self.converged_ = True
+            return np.zeros(0)
+        AT = A.T.tocsr().astype(np.float64)
+        x0 = None if x0 is None else np.asarray(x0, dtype=np.float64)
+        if kind == 'eigenvector':
+            return self._eigenvector(AT, x0)
+        if kind == 'pagerank':
+            return self._pagerank(AT, x0, 0.85 if alpha is None else alpha)
+        return self._katz(AT, x0, 0.1 if alpha is None else alpha, beta)
+
+    def telemetry(self):
+        """
+        Resumen de la última ejecución: medida calculada, convergencia, iteraciones,
+        residuos y tiempos por iteración, y la medida original si hubo recurso a otra.
+        """
+        return {
+            'kind': self.kind_,
+            'converged': self.converged_,
+            'iterations': self.iterations_,
+            'fallback_from': self.fallback_from_,
+            'residuals': list(self.residuals_),
+            'timings': list(self.timings_),
+        }
+
+    def _iterate(self, step, x):
+        """
+        Aplica `step` hasta que el cambio L1 baje de n * tol, registrando la telemetría.
+        """
+        threshold = len(x) * self.tol
+        for _ in range(self.max_iter):
+            start = time.perf_counter()
+            x_next = step(x)
+            residual = float(np.abs(x_next - x).sum())
+            self.timings_.append(time.perf_counter() - start)
+            self.residuals_.append(residual)
+            self.iterations_ += 1
+            x = x_next
+            if not np.isfinite(residual):
+                break
+            if residual < threshold:
+                self.converged_ = True
+                break
+        return x
+
+    def _start(self, x0, n, default):
+        if x0 is None or len(x0) != n or not np.isfinite(x0).all() or x0.sum() <= 0:
+            return np.full(n, default)
+        return x0 / x0.sum()
+
+    def _eigenvector(self, AT, x0):
+        n = AT.shape[0]
+
+        def step(x):
+            # Iteración desplazada (I + Aᵀ) de networkx, normalizada en L2
+            x_next = x + AT @ x
+            norm = np.linalg.norm(x_next)
+            return x_next / norm if norm > 0 else x_next
+
+        x = self._iterate(step, self._start(x0, n, 1.0 / n))
+        if self.converged_ and x.sum() <= 0:
+            self.converged_ = False
+        return x
+
+    def _pagerank(self, AT, x0, alpha):
+        n = AT.shape[0]
+        out_degree = np.asarray(AT.sum(axis=0)).ravel()
+        dangling = out_degree == 0
+        scale = np.divide(1.0, out_degree, out=np.zeros(n), where=~dangling)
+        P = AT @ sp.diags(scale)
+
+        def step(x):
+            return alpha * (P @ x + x[dangling].sum() / n) + (1 - alpha) / n
+
+        return self._iterate(step, self._start(x0, n, 1.0 / n))
+
+    def _katz(self, AT, x0, alpha, beta):
+        n = AT.shape[0]
+
+        def step(x):
+            return alpha * (AT @ x) + beta
+
+        x = np.zeros(n)
+        if x0 is not None and len(x0) == n and np.isfinite(x0).all():
+            # El resultado previo está normalizado: se reescala por mínimos cuadrados para
+            # que c * x0 sea lo más cercano posible a un punto fijo de la iteración
+            d = x0 - alpha * (AT @ x0)
+            if (d * d).sum() > 0:
+                x = x0 * (beta * d.sum() / (d * d).sum())
+        x = self._iterate(step, x)
+        norm = np.linalg.norm(x)
+        return x / norm if self.converged_ and norm > 0 else x
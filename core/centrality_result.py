@@ -0,0 +1,102 @@
+# core/centrality_result.py
+import numpy as np
+
+from core.graph_arrays import top_k_indices
+
+
+class CentralityResult:
+    """
+    Centralidades como arreglos NumPy alineados con un arreglo de nodos (el de
+    GraphArrays). Las consultas (top_k, valor de un nodo) trabajan sobre los arreglos y
+    los diccionarios nodo -> valor solo se construyen si se piden con to_dict.
+    """
+
+    def __init__(self, nodes, values, index=None, attrs=None, G=None):
+        """
+        :param nodes: Arreglo de IDs de nodo.
+        :param values: Diccionario medida -> arreglo alineado con nodes.
+        :param index: Diccionario nodo -> posición (se construye si no se da).
+        :param attrs: NodeAttributeStore para filtrar por tipo y plataforma.
+        :param G: Grafo del que leer 'tipo' si no hay almacén (la plataforma solo vive en
+            el almacén).
+        """
+        self.nodes = nodes
+        self.values = {measure: np.asarray(array) for measure, array in values.items()}
+        for measure, array in self.values.items():
+            if len(array) != len(nodes):
+                raise ValueError(f"La medida '{measure}' no está alineada con los nodos.")
+        self._index = index
+        self.attrs = attrs
+        self.G = G
+        self._masks = {}
+
+    @property
+    def measures(self):
+        return list(self.values)
+
+    @property
+    def index(self):
+        if self._index is None:
+            self._index = {node: i for i, node in enumerate(self.nodes.tolist())}
+        return self._index
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def __getitem__(self, measure):
+        if measure not in self.values:
+            raise ValueError(f'Medida de centralidad no calculada: {measure}')
+        return self.values[measure]
+
+    def value(self, node, measure):
+        return float(self[measure][self.index[node]])
+
+    def mask(self, tipo=None, plataforma=None):
+        """
+        Máscara booleana de los nodos de un tipo y/o plataforma (valor o tupla de valores),
+        leída de los índices del almacén de atributos y reutilizada entre consultas.
+        """
+        key = (tipo, plataforma)
+        if plataforma is not None and self.attrs is None:
+            raise ValueError('Filtrar por plataforma requiere el almacén de atributos (attrs).')
+        if key not in self._masks:
+            mask = np.zeros(len(self.nodes), dtype=bool)
+            if self.attrs is not None:
+                index = self.index
+                members = self.attrs.members(tipo=tipo, plataforma=plataforma)
+                mask[[index[node] for node in members if node in index]] = True
+            elif self.G is not None:
+                allowed = (tipo,) if isinstance(tipo, str) else tuple(tipo)
+                mask[:] = [
+                    self.G.nodes[node].get('tipo') in allowed for node in self.nodes.tolist()
+                ]
+            else:
+                raise ValueError('Filtrar por tipo requiere attrs o el grafo.')
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def top_k(self, measure, k=10, tipo=None, plataforma=None, positive=False):
+        """
+        Los k nodos con mayor valor de una medida, con selección parcial sobre el arreglo.
+        :param tipo: Restringe a un tipo de nodo (o tupla de tipos).
+        :param plataforma: Restringe a una plataforma (o tupla de plataformas).
+        :param positive: Descarta los nodos con valor 0.
+        :return: Lista de (nodo, valor) de mayor a menor.
+        """
+        values = self[measure]
+        if tipo is None and plataforma is None:
+            selected = top_k_indices(values, k)
+        else:
+            candidates = np.flatnonzero(self.mask(tipo=tipo, plataforma=plataforma))
+            selected = candidates[top_k_indices(values[candidates], k)]
+        if positive:
+            selected = selected[values[selected] > 0]
+        return list(zip(self.nodes[selected].tolist(), values[selected].tolist()))
+
+    def to_dict(self, measure=None):
+        """
+        Forma de diccionario nodo -> valor de una medida, o medida -> diccionario de todas.
+        """
+        if measure is not None:
+            return dict(zip(self.nodes.tolist(), self[measure].tolist()))
+        return {name: self.to_dict(name) for name in self.values}
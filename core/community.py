@@ -0,0 +1,388 @@
+# core/community.py
+from collections import deque
+
+import numpy as np
+import scipy.sparse as sp
+
+
+def modularity(A, membership, resolution=1.0):
+    """
+    Modularidad de una partición sobre una matriz de adyacencia simétrica (CSR), con la
+    convención de que un lazo de peso w se guarda como 2w en la diagonal.
+    """
+    m2 = A.sum()
+    if m2 == 0:
+        return 0.0
+    membership = np.asarray(membership)
+    coo = A.tocoo()
+    same = membership[coo.row] == membership[coo.col]
+    k = membership.max() + 1
+    internal = np.bincount(membership[coo.row[same]], weights=coo.data[same], minlength=k)
+    degree = np.asarray(A.sum(axis=1)).ravel()
+    tot = np.bincount(membership, weights=degree, minlength=k)
+    return float(internal.sum() / m2 - resolution * np.square(tot / m2).sum())
+
+
+def relabel_by_size(membership):
+    """
+    Renumera las comunidades de forma consecutiva, de la más grande a la más pequeña
+    (empates por primera aparición).
+    """
+    _, first, inverse, counts = np.unique(
+        membership, return_index=True, return_inverse=True, return_counts=True
+    )
+    order = np.lexsort((first, -counts))
+    rank = np.empty(len(order), dtype=np.int64)
+    rank[order] = np.arange(len(order))
+    return rank[inverse.ravel()]
+
+
+def membership_to_sets(nodes, membership, min_size=1):
+    """
+    Convierte un arreglo nodo -> comunidad en una lista de conjuntos de nodos, en el orden
+    de las etiquetas (de la más grande a la más pequeña tras relabel_by_size).
+    """
+    order = np.argsort(membership, kind='stable')
+    counts = np.bincount(membership)
+    groups = np.split(np.asarray(nodes, dtype=object)[order], np.cumsum(counts)[:-1])
+    return [set(group.tolist()) for group in groups if len(group) >= min_size]
+
+
+def initial_membership(index, previous):
+    """
+    Traduce una partición previa a un arreglo alineado con un índice nodo -> entero.
+    Los nodos sin comunidad previa (nuevos) quedan con -1.
+    :param index: Diccionario nodo -> posición (p. ej. GraphArrays.index).
+    :param previous: Diccionario nodo -> comunidad o lista de conjuntos de nodos.
+    """
+    if not isinstance(previous, dict):
+        previous = {node: c for c, community in enumerate(previous) for node in community}
+    membership = np.full(len(index), -1, dtype=np.int64)
+    for node, community in previous.items():
+        position = index.get(node)
+        if position is not None:
+            membership[position] = community
+    return membership
+
+
+class CommunityEngine:
+    """
+    Detección de comunidades sobre arreglos enteros (matriz CSR simétrica): fase de
+    movimientos locales estilo Louvain con cola de nodos, refinamiento estilo Leiden
+    (solo se fusionan nodos bien conectados dentro de su comunidad) y agregación con
+    productos de matrices dispersas. El resultado es un arreglo nodo -> comunidad.
+    """
+
+    def __init__(self, resolution=1.0, seed=42, refine=True, max_levels=50):
+        """
+        :param resolution: Parámetro de resolución (mayor -> comunidades más pequeñas).
+        :param seed: Semilla del orden aleatorio de visita de los nodos.
+        :param refine: Aplica el refinamiento de Leiden antes de agregar.
+        :param max_levels: Número máximo de niveles de agregación.
+        """
+        self.resolution = resolution
+        self.seed = seed
+        self.refine = refine
+        self.max_levels = max_levels
+        self.modularity_ = None
+        self.initial_modularity_ = None
+        self.modularity_delta_ = None
+        self.num_levels_ = 0
+        # Dendrograma: partición de los nodos originales tras cada nivel (int32)
+        self.levels_ = []
+        self.level_modularity_ = []
+        self.sweep_modularity_ = {}
+
+    def fit(self, A, initial=None, changed=None, reduction=None):
+        """
+        Calcula la partición de una matriz de adyacencia simétrica.
+        :param A: Matriz CSR n x n (lazos como 2w en la diagonal).
+        :param initial: Partición previa (arreglo de enteros, -1 para nodos nuevos) usada
+            como asignación inicial en lugar de comunidades unitarias.
+        :param changed: Nodos (índices o máscara booleana) cuyo vecindario cambió. Con una
+            partición inicial, solo ellos, sus vecinos y los nodos nuevos se reoptimizan en
+            el primer nivel; el resto conserva su comunidad hasta la agregación.
+        :param reduction: GraphReduction de A; la detección se hace sobre el grafo
+            reducido y cada nodo colapsado hereda la comunidad de su representante.
+        :return: Arreglo de enteros con la comunidad de cada nodo (0 = la más grande).
+        """
+        if reduction is not None:
+            return self._fit_reduced(A, reduction, initial, changed)
+        A = sp.csr_matrix(A, dtype=np.float64)
+        n = A.shape[0]
+        rng = np.random.default_rng(self.seed)
+        flat = np.arange(n)
+        self.levels_ = []
+        self.level_modularity_ = []
+        if n == 0 or A.sum() == 0:
+            self.modularity_ = 0.0
+            return flat
+
+        level_A = A
+        membership = np.arange(n)
+        queue = None
+        if initial is not None:
+            membership, queue = self._warm_start(A, initial, changed)
+            self.initial_modularity_ = modularity(A, membership, self.resolution)
+            if queue is not None and len(queue) == 0:
+                # Nada que reoptimizar: se conserva la partición previa tal cual
+                result = relabel_by_size(membership)
+                self._record_level(A, result)
+                self.modularity_ = self.initial_modularity_
+                self.modularity_delta_ = 0.0
+                return result
+
+        self.num_levels_ = 0
+        for _ in range(self.max_levels):
+            membership, touched = self._local_move(level_A, membership, rng, nodes=queue)
+            labels, membership = np.unique(membership, return_inverse=True)
+            membership = membership.ravel()
+            num_communities = membership.max() + 1
+            self.num_levels_ += 1
+            self._record_level(A, membership[flat])
+            if num_communities == level_A.shape[0]:
+                break
+
+            if not self.refine:
+                groups = membership
+            elif queue is None:
+                groups = self._refine(level_A, membership, rng)
+            else:
+                # Arranque en caliente: solo se refinan las comunidades que cambiaron
+                touched = np.searchsorted(labels, np.fromiter(touched, dtype=np.int64))
+                nodes = np.flatnonzero(np.isin(membership, touched))
+                groups = self._refine(level_A, membership, rng, nodes=nodes)
+            queue = None
+            groups = np.unique(groups, return_inverse=True)[1].ravel()
+            if groups.max() + 1 == level_A.shape[0]:
+                # El refinamiento no redujo el grafo: se agrega por la partición sin refinar
+                groups = membership
+
+            level_A, membership = self._aggregate(level_A, membership, groups)
+            flat = groups[flat]
+
+        result = relabel_by_size(membership[flat])
+        self.modularity_ = modularity(A, result, self.resolution)
+        if self.initial_modularity_ is not None:
+            self.modularity_delta_ = self.modularity_ - self.initial_modularity_
+        return result
+
+    def _fit_reduced(self, A, reduction, initial, changed):
+        """
+        Ajusta sobre la matriz reducida y expande la partición a los nodos originales.
+        La modularidad coincide con la del grafo reducido porque Pᵀ A P la conserva.
+        """
+        if initial is not None:
+            initial = reduction.reduce(initial)
+        if changed is not None:
+            changed = np.asarray(changed)
+            changed = np.flatnonzero(changed) if changed.dtype == bool else changed.astype(np.intp)
+            changed = reduction.reduce_nodes(changed)
+        reduced = self.fit(reduction.matrix, initial=initial, changed=changed)
+        # Se renumera de nuevo: los tamaños cuentan ahora los nodos originales
+        self.levels_ = [
+            relabel_by_size(reduction.expand(level)).astype(np.int32) for level in self.levels_
+        ]
+        return relabel_by_size(reduction.expand(reduced))
+
+    def _record_level(self, A, membership):
+        """
+        Guarda la partición de los nodos originales de un nivel si difiere de la anterior.
+        """
+        level = relabel_by_size(membership).astype(np.int32)
+        if self.levels_ and np.array_equal(level, self.levels_[-1]):
+            return
+        self.levels_.append(level)
+        self.level_modularity_.append(modularity(A, level, self.resolution))
+
+    def sweep(self, A, resolutions):
+        """
+        Particiones para varias resoluciones en una sola pasada descendente: tras cada
+        resolución el grafo se agrega por la partición obtenida (Pᵀ A P) y la siguiente,
+        más baja, parte de ese grafo reducido, de modo que cada comunidad es unión de
+        comunidades de la resolución anterior y las pasadas son cada vez más baratas.
+        :param A: Matriz CSR simétrica.
+        :param resolutions: Resoluciones a evaluar (en cualquier orden).
+        :return: Diccionario resolución -> arreglo nodo -> comunidad.
+        """
+        A = sp.csr_matrix(A, dtype=np.float64)
+        current = A
+        mapping = np.arange(A.shape[0])
+        results = {}
+        self.sweep_modularity_ = {}
+        for resolution in sorted(set(resolutions), reverse=True):
+            engine = CommunityEngine(
+                resolution=resolution,
+                seed=self.seed,
+                refine=self.refine,
+                max_levels=self.max_levels,
+            )
+            membership = engine.fit(current)
+            results[resolution] = relabel_by_size(membership[mapping])
+            # La agregación conserva la modularidad, así que el valor del grafo reducido vale
+            self.sweep_modularity_[resolution] = engine.modularity_
+            if current.shape[0] > 1:
+                k = membership.max() + 1
+                P = sp.csr_matrix(
+                    (np.ones(len(membership)), (np.arange(len(membership)), membership)),
+                    shape=(len(membership), k),
+                )
+                current = (P.T @ current @ P).tocsr()
+                mapping = membership[mapping]
+        return results
+
+    def _warm_start(self, A, initial, changed):
+        """
+        Prepara la asignación inicial (los nodos nuevos quedan en comunidades unitarias) y
+        la cola de nodos a reoptimizar: nodos cambiados o nuevos y sus vecinos. La cola
+        queda vacía si no cambió ni se añadió ningún nodo.
+        """
+        n = A.shape[0]
+        membership = np.asarray(initial, dtype=np.int64).copy()
+        new = membership < 0
+        membership[new] = membership.max() + 1 + np.arange(new.sum())
+        membership = np.unique(membership, return_inverse=True)[1].ravel()
+
+        if changed is None:
+            return membership, None
+        changed = np.asarray(changed)
+        if changed.dtype != bool:
+            changed = changed.astype(np.intp)
+        seeds = np.zeros(n, dtype=bool)
+        seeds[changed] = True
+        seeds |= new
+        neighborhood = A[np.flatnonzero(seeds)].indices
+        seeds[neighborhood] = True
+        return membership, np.flatnonzero(seeds)
+
+    def _aggregate(self, A, membership, groups):
+        """
+        Colapsa cada grupo en un nodo (A' = Pᵀ A P). Los nodos agregados heredan la
+        comunidad (sin refinar) de sus miembros.
+        """
+        n, k = A.shape[0], groups.max() + 1
+        P = sp.csr_matrix((np.ones(n), (np.arange(n), groups)), shape=(n, k))
+        aggregated = (P.T @ A @ P).tocsr()
+        next_membership = np.empty(k, dtype=np.int64)
+        next_membership[groups] = membership
+        return aggregated, next_membership
+
+    def _local_move(self, A, membership, rng, nodes=None):
+        """
+        Mueve nodos a la comunidad vecina con mayor ganancia de modularidad. Solo se
+        revisitan los vecinos de los nodos que cambian de comunidad.
+        :param nodes: Nodos con los que se inicializa la cola (por defecto, todos).
+        :return: (partición, conjunto de comunidades que ganaron o perdieron nodos)
+        """
+        n = A.shape[0]
+        indptr, indices, data = A.indptr, A.indices, A.data
+        degree = np.asarray(A.sum(axis=1)).ravel()
+        gamma = self.resolution / degree.sum()
+        tot = np.bincount(membership, weights=degree, minlength=n).tolist()
+        membership = membership.tolist()
+        degree = degree.tolist()
+
+        order = rng.permutation(n if nodes is None else np.asarray(nodes))
+        queue = deque(order.tolist())
+        queued = np.zeros(n, dtype=bool)
+        queued[order] = True
+        touched = set()
+        while queue:
+            v = queue.popleft()
+            queued[v] = False
+            start, end = indptr[v], indptr[v + 1]
+            neighbors = indices[start:end].tolist()
+            weights = data[start:end].tolist()
+
+            current = membership[v]
+            kv = degree[v]
+            tot[current] -= kv
+            links = {}
+            for u, w in zip(neighbors, weights):
+                if u != v:
+                    c = membership[u]
+                    links[c] = links.get(c, 0.0) + w
+
+            best = current
+            best_gain = links.get(current, 0.0) - tot[current] * kv * gamma
+            for c, w in links.items():
+                gain = w - tot[c] * kv * gamma
+                if gain > best_gain:
+                    best, best_gain = c, gain
+            tot[best] += kv
+
+            if best != current:
+                membership[v] = best
+                touched.update((current, best))
+                for u in neighbors:
+                    if u != v and not queued[u] and membership[u] != best:
+                        queue.append(u)
+                        queued[u] = True
+        return np.asarray(membership, dtype=np.int64), touched
+
+    def _refine(self, A, membership, rng, nodes=None):
+        """
+        Refinamiento de Leiden: dentro de cada comunidad, parte de subcomunidades unitarias
+        y fusiona cada nodo aún aislado con la subcomunidad bien conectada de mayor ganancia.
+        Garantiza que las comunidades agregadas estén conectadas internamente.
+        :param nodes: Nodos a refinar (por defecto, todos). Los demás se agrupan tal cual
+            por su comunidad.
+        """
+        n = A.shape[0]
+        indptr, indices, data = A.indptr, A.indices, A.data
+        degree = np.asarray(A.sum(axis=1)).ravel()
+        gamma = self.resolution / degree.sum()
+        community_tot = np.bincount(membership, weights=degree).tolist()
+        nodes = np.arange(n) if nodes is None else np.asarray(nodes)
+        membership = membership.tolist()
+        degree = degree.tolist()
+
+        # Etiquetas n + comunidad para los nodos que no se refinan
+        refined = [n + c for c in membership]
+        refined_tot = [0.0] * n
+        singleton = [False] * n
+        external = [0.0] * n
+        for v in nodes.tolist():
+            refined[v] = v
+            refined_tot[v] = degree[v]
+            singleton[v] = True
+            # Peso de cada subcomunidad hacia el resto de su comunidad
+            start, end = indptr[v], indptr[v + 1]
+            external[v] = sum(
+                w
+                for u, w in zip(indices[start:end].tolist(), data[start:end].tolist())
+                if u != v and membership[u] == membership[v]
+            )
+
+        for v in rng.permutation(nodes).tolist():
+            if not singleton[v]:
+                continue
+            S = membership[v]
+            kv = degree[v]
+            if external[v] < gamma * kv * (community_tot[S] - kv):
+                continue
+
+            start, end = indptr[v], indptr[v + 1]
+            links = {}
+            for u, w in zip(indices[start:end].tolist(), data[start:end].tolist()):
+                if u != v and membership[u] == S:
+                    c = refined[u]
+                    links[c] = links.get(c, 0.0) + w
+
+            best, best_gain = None, 0.0
+            for c, w in links.items():
+                well_connected = external[c] >= gamma * refined_tot[c] * (
+                    community_tot[S] - refined_tot[c]
+                )
+                gain = w - refined_tot[c] * kv * gamma
+                if well_connected and gain > best_gain:
+                    best, best_gain = c, gain
+            if best is None:
+                continue
+
+            refined[v] = best
+            refined_tot[best] += kv
+            external[best] += external[v] - 2 * links[best]
+            singleton[v] = False
+            singleton[best] = False
+        return np.asarray(refined, dtype=np.int64)
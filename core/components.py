@@ -0,0 +1,233 @@
+# core/components.py
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import scipy.sparse as sp
+
+from core.centrality import BetweennessEngine, ClosenessEngine
+
+
+def weak_components(n, src, dst):
+    """
+    Componentes débilmente conexas con una unión-búsqueda sobre arreglos: en cada ronda
+    la raíz mayor de cada arista se engancha a la menor (np.minimum.at) y después se
+    comprimen los caminos saltando de padre en padre hasta que todo apunta a su raíz.
+    :return: Arreglo nodo -> componente (etiquetas consecutivas desde 0).
+    """
+    parent = np.arange(n)
+    src = np.asarray(src, dtype=np.int64)
+    dst = np.asarray(dst, dtype=np.int64)
+    while True:
+        a, b = parent[src], parent[dst]
+        pending = a != b
+        if not pending.any():
+            break
+        low, high = np.minimum(a[pending], b[pending]), np.maximum(a[pending], b[pending])
+        np.minimum.at(parent, high, low)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+    return np.unique(parent, return_inverse=True)[1].ravel()
+
+
+def _component_task(A, measures, k, seed, precision):
+    """
+    Centralidades de un lote de componentes (matriz diagonal por bloques), normalizadas
+    respecto al tamaño del lote. Se ejecuta en un proceso trabajador.
+    """
+    results = {}
+    if 'betweenness' in measures:
+        engine = BetweennessEngine(k=k, n_jobs=1, seed=seed)
+        results['betweenness'] = engine.compute(A)
+    if 'closeness' in measures:
+        results['closeness'] = ClosenessEngine(precision=precision, seed=seed).compute(A)
+    return results
+
+
+class ComponentCentrality:
+    """
+    Intermediación y cercanía descompuestas por componentes débilmente conexas. Los
+    caminos nunca cruzan de una componente a otra, así que cada una se calcula por
+    separado: los nodos aislados, pares y estrellas de forma analítica, y el resto en un
+    pool de procesos (las componentes pequeñas, agrupadas en lotes diagonales por
+    bloques). Los valores se reescalan al tamaño del grafo completo, igual que networkx.
+    """
+
+    MEASURES = ('betweenness', 'closeness')
+
+    def __init__(self, k=500, batch_size=2000, n_jobs=None, seed=42, precision=8):
+        """
+        :param k: Pivotes de intermediación por componente (exacta si la componente o
+            el lote tiene como mucho k nodos).
+        :param batch_size: Nodos máximos por lote de componentes pequeñas.
+        :param n_jobs: Procesos del pool (por defecto, todos los núcleos; 1 = sin pool).
+        :param seed: Semilla de pivotes y contadores.
+        :param precision: Precisión de HyperBall en componentes grandes.
+        """
+        self.k = k
+        self.batch_size = batch_size
+        self.n_jobs = n_jobs or os.cpu_count() or 1
+        self.seed = seed
+        self.precision = precision
+        self.num_components_ = 0
+        self.num_trivial_ = 0
+        self.num_batches_ = 0
+
+    def compute(self, A, measures=MEASURES):
+        """
+        :param A: Matriz CSR de adyacencia (dirigida o simétrica); solo se usa su patrón.
+        :param measures: Medidas a calcular ('betweenness', 'closeness').
+        :return: Diccionario medida -> arreglo alineado con las filas de A.
+        """
+        unknown = set(measures) - set(self.MEASURES)
+        if unknown:
+            raise ValueError(f'Medidas no soportadas por componentes: {sorted(unknown)}')
+        n = A.shape[0]
+        A = sp.csr_matrix(A, dtype=np.float64)
+        A.setdiag(0)
+        A.eliminate_zeros()
+        A.data[:] = 1.0
+        coo = A.tocoo()
+        component = weak_components(n, coo.row, coo.col)
+        sizes = np.bincount(component, minlength=1) if n else np.zeros(0, dtype=np.int64)
+        self.num_components_ = len(sizes)
+
+        results = {measure: np.zeros(n) for measure in measures}
+        star = self._stars(A, component, sizes)
+        self.num_trivial_ = int((star | (sizes == 1)).sum())
+        self._star_centrality(A, component, sizes, star, results)
+
+        nodes_by_component = np.argsort(component, kind='stable')
+        bounds = np.r_[0, np.cumsum(sizes)]
+        pending = np.flatnonzero(~star & (sizes > 1))
+        batches = self._batches(pending, sizes)
+        self.num_batches_ = len(batches)
+        tasks = [
+            np.concatenate([nodes_by_component[bounds[c] : bounds[c + 1]] for c in batch])
+            for batch in batches
+        ]
+        submatrices = [A[members][:, members] for members in tasks]
+        if self.n_jobs == 1 or len(tasks) <= 1:
+            outputs = [self._run(S, measures) for S in submatrices]
+        else:
+            count = len(submatrices)
+            with ProcessPoolExecutor(max_workers=self.n_jobs) as executor:
+                outputs = list(
+                    executor.map(
+                        _component_task,
+                        submatrices,
+                        [measures] * count,
+                        [self.k] * count,
+                        [self.seed] * count,
+                        [self.precision] * count,
+                    )
+                )
+
+        for members, output in zip(tasks, outputs):
+            self._stitch(results, members, output, n)
+        return results
+
+    def _run(self, S, measures):
+        return _component_task(S, measures, self.k, self.seed, self.precision)
+
+    def _batches(self, components, sizes):
+        """
+        Agrupa componentes pequeñas en lotes de hasta batch_size nodos; cada componente
+        mayor que batch_size forma su propio lote.
+        """
+        batches = []
+        current, current_size = [], 0
+        for c in components[np.argsort(sizes[components], kind='stable')].tolist():
+            size = int(sizes[c])
+            if size > self.batch_size:
+                batches.append([c])
+                continue
+            if current and current_size + size > min(self.batch_size, self.k):
+                batches.append(current)
+                current, current_size = [], 0
+            current.append(c)
+            current_size += size
+        if current:
+            batches.append(current)
+        return batches
+
+    @staticmethod
+    def _stitch(results, members, output, n):
+        """
+        Lleva las medidas normalizadas con el tamaño del lote (m) a la escala de n.
+        """
+        m = len(members)
+        if 'betweenness' in output:
+            scale = 0.0
+            if n > 2 and m > 2:
+                scale = (m - 1) * (m - 2) / ((n - 1) * (n - 2))
+            results['betweenness'][members] = output['betweenness'] * scale
+        if 'closeness' in output:
+            scale = (m - 1) / (n - 1) if n > 1 else 0.0
+            results['closeness'][members] = output['closeness'] * scale
+
+    @staticmethod
+    def _stars(A, component, sizes):
+        """
+        Marca las componentes que son estrellas (incluidos los pares): n_c - 1 pares
+        conectados y un nodo unido a todos los demás.
+        """
+        S = A + A.T
+        S.data[:] = 1.0
+        degree = np.diff(S.tocsr().indptr)
+        pairs = np.bincount(component, weights=degree, minlength=len(sizes)) / 2
+        hub = np.zeros(len(sizes), dtype=bool)
+        hub[component[degree == sizes[component] - 1]] = True
+        return (sizes >= 2) & (pairs == sizes - 1) & hub
+
+    @staticmethod
+    def _star_centrality(A, component, sizes, star, results):
+        """
+        Intermediación y cercanía analíticas de las estrellas. Con centro c, i hojas que
+        apuntan a c, o hojas a las que apunta c y b hojas en ambos sentidos:
+        - El centro intermedia i * o - b pares ordenados y lo alcanzan i nodos a
+          distancia 1.
+        - Una hoja j con c -> j es alcanzada por c (distancia 1) y por las demás hojas
+          entrantes (distancia 2); el resto de hojas no es alcanzado por nadie.
+        """
+        n = A.shape[0]
+        in_star = star[component]
+        if not in_star.any():
+            return
+        S = A + A.T
+        S.data[:] = 1.0
+        degree = np.diff(S.tocsr().indptr)
+        candidate = in_star & (degree == sizes[component] - 1)
+        # En los pares ambos nodos cumplen: el centro es el primero de la componente
+        first = np.full(len(sizes), n)
+        np.minimum.at(first, component[candidate], np.flatnonzero(candidate))
+        center_of = first[component]
+        is_center = in_star & (np.arange(n) == center_of)
+        leaf = in_star & ~is_center
+
+        coo = A.tocoo()
+        to_center = leaf[coo.row] & is_center[coo.col]
+        from_center = is_center[coo.row] & leaf[coo.col]
+        leaf_in = np.zeros(n, dtype=bool)
+        leaf_out = np.zeros(n, dtype=bool)
+        leaf_in[coo.row[to_center]] = True
+        leaf_out[coo.col[from_center]] = True
+
+        k = len(sizes)
+        ins = np.bincount(component[leaf_in], minlength=k).astype(np.float64)
+        outs = np.bincount(component[leaf_out], minlength=k).astype(np.float64)
+        both = np.bincount(component[leaf_in & leaf_out], minlength=k).astype(np.float64)
+
+        if 'betweenness' in results and n > 2:
+            raw = ins * outs - both
+            results['betweenness'][is_center] = raw[component[is_center]] / ((n - 1) * (n - 2))
+        if 'closeness' in results and n > 1:
+            closeness = results['closeness']
+            centers = component[is_center]
+            closeness[is_center] = ins[centers] / (n - 1)
+            reached_leaf = leaf & leaf_out
+            others = ins[component[reached_leaf]] - leaf_in[reached_leaf]
+            closeness[reached_leaf] = (1 + others) ** 2 / ((1 + 2 * others) * (n - 1))
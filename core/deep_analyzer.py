@@ -1,7 +1,29 @@
+import multiprocessing
+import os
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
 import pandas as pd
 from collections import Counter
 import networkx as nx
-from sklearn.metrics import precision_score, recall_score, f1_score
+
+from core.centrality import BetweennessEngine, ClosenessEngine, SpectralEngine
+from core.centrality_result import CentralityResult
+from core.clustering import (
+    clustering_from_triangles,
+    local_clustering,
+    sampled_average_clustering,
+    sampled_transitivity,
+    transitivity,
+)
+from core.community import CommunityEngine, initial_membership
+from core.components import ComponentCentrality
+from core.evaluation import ConfusionMatrix
+from core.graph_views import GraphViews
 
 
 class DeepAnalyzer:
@@ -12,12 +34,45 @@ class DeepAnalyzer:
     - Métricas de Centralidad, Densidad y Modularidad
     """
 
-    def __init__(self, G):
+    def __init__(self, G, attrs=None, cache=None):
         """
         Inicializa el DeepAnalyzer con un grafo G.
         :param G: Grafo de la red construido previamente.
+        :param attrs: NodeAttributeStore opcional con los atributos de los nodos
+            (evita escribir 'Plataforma' en el grafo).
+        :param cache: ResultCache opcional; centralidades, densidad y comunidades se
+            reutilizan mientras el grafo y los parámetros no cambien.
         """
         self.G = G
+        self.attrs = attrs
+        self.cache = cache
+        # Telemetría de la última centralidad espectral (residuos, tiempos, recurso)
+        self.spectral_telemetry = None
+
+    @property
+    def views(self):
+        # Se resuelve en cada acceso: si el grafo cambió, el registro entrega vistas nuevas
+        return GraphViews.of(self.G)
+
+    @property
+    def arrays(self):
+        # Representación en arreglos compartida con el resto de analizadores del mismo grafo
+        return self.views.arrays
+
+    def _cached(self, name, params, compute):
+        if self.cache is None:
+            return compute()
+        return self.cache.cached(self.arrays.fingerprint(), name, params, compute)
+
+    def _adjacency(self):
+        """
+        Matriz CSR binaria del grafo: dirigida si G lo es, simétrica en otro caso.
+        """
+        if self.G.is_directed():
+            return self.arrays.adjacency()
+        A = self.arrays.undirected().copy()
+        A.data[:] = 1.0
+        return A
 
     def classify_captures(self, dataset):
         """
@@ -46,129 +101,705 @@ class DeepAnalyzer:
             if node in node_platform_map:
                 self.G.nodes[node]['Plataforma'] = node_platform_map[node]
 
-    def centrality_metrics(self):
+    def centrality_metrics(
+        self,
+        k=500,
+        seed=42,
+        epsilon=None,
+        n_jobs=None,
+        closeness_method='auto',
+        precision=8,
+        by_component=False,
+    ):
         """
         Calcula métricas de centralidad para el grafo usando aproximaciones avanzadas.
+        :param k: Número de nodos pivote para aproximar la intermediación.
+        :param seed: Semilla de la selección de pivotes.
+        :param epsilon: Error absoluto máximo de la intermediación; si se indica, se
+            muestrean caminos (Riondato y Kornaropoulos) en lugar de usar k pivotes.
+        :param n_jobs: Procesos para la intermediación (por defecto, todos los núcleos).
+        :param closeness_method: 'exact', 'hyperball' o 'auto' (exacto en grafos pequeños).
+        :param precision: Precisión (log2 de registros) de los contadores de HyperBall.
+        :param by_component: Calcula intermediación y cercanía por componentes débilmente
+            conexas (ver component_centrality); epsilon y closeness_method no se usan.
         :return: Diccionario con medidas de centralidad (grado, cercanía, intermediación, eigenvector).
         """
-        degree_centrality = nx.degree_centrality(self.G)
-        closeness_centrality = nx.closeness_centrality(self.G)
-        betweenness_centrality = nx.betweenness_centrality(
-            self.G, k=min(500, len(self.G))
-        )  # Aproximación
-        eigenvector_centrality = nx.eigenvector_centrality(self.G, max_iter=1000)
+        result = self.centralities(
+            k, seed, epsilon, n_jobs, closeness_method, precision, by_component
+        )
+        return {f'{measure}_centrality': result.to_dict(measure) for measure in result.measures}
 
-        return {
-            'degree_centrality': degree_centrality,
-            'closeness_centrality': closeness_centrality,
-            'betweenness_centrality': betweenness_centrality,
-            'eigenvector_centrality': eigenvector_centrality,
-        }
+    def centralities(
+        self,
+        k=500,
+        seed=42,
+        epsilon=None,
+        n_jobs=None,
+        closeness_method='auto',
+        precision=8,
+        by_component=False,
+    ):
+        """
+        Las mismas medidas que centrality_metrics, como arreglos alineados con los nodos
+        (CentralityResult), sin construir diccionarios por nodo. Admite consultas como
+        result.top_k('betweenness', 10, plataforma='Twitter').
+        :return: CentralityResult con 'degree', 'closeness', 'betweenness' y 'eigenvector'.
+        """
+        # Cada medida pasa por la caché con su propia clave, compartida con analyze
+        values = self._centrality_values(
+            k, seed, epsilon, n_jobs, closeness_method, precision, by_component
+        )
+        return self.centrality_result(values)
+
+    def centrality_result(self, values):
+        """
+        Envuelve un diccionario medida -> arreglo (alineado con self.arrays.nodes).
+        """
+        arrays = self.arrays
+        return CentralityResult(
+            arrays.nodes, values, index=arrays.index, attrs=self.attrs, G=self.G
+        )
+
+    def _centrality_values(
+        self,
+        k,
+        seed,
+        epsilon=None,
+        n_jobs=None,
+        closeness_method='auto',
+        precision=8,
+        by_component=False,
+    ):
+        values = {'degree': self.arrays.degree_centrality()}
+        if by_component:
+            by_measure = self._component_values(k, seed, n_jobs, precision)
+            values['closeness'] = by_measure['closeness']
+            values['betweenness'] = by_measure['betweenness']
+        else:
+            values['closeness'] = self._closeness_values(closeness_method, precision, seed=seed)
+            values['betweenness'] = self._betweenness_values(k, seed, epsilon, n_jobs)
+        values['eigenvector'] = self._spectral_values('eigenvector', max_iter=1000)
+        return values
+
+    def _as_dict(self, values):
+        return dict(zip(self.arrays.nodes.tolist(), values.tolist()))
+
+    def component_centrality(self, k=500, seed=42, n_jobs=None, precision=8):
+        """
+        Intermediación y cercanía calculadas por componentes débilmente conexas: nodos
+        aislados, pares y estrellas se resuelven analíticamente y el resto de componentes
+        se reparte entre procesos. Los valores se normalizan con el tamaño del grafo.
+        :return: Diccionario medida ('betweenness', 'closeness') -> {nodo: valor}.
+        """
+        values = self._component_values(k, seed, n_jobs, precision)
+        return {measure: self._as_dict(array) for measure, array in values.items()}
+
+    def _component_values(self, k=500, seed=42, n_jobs=None, precision=8):
+        def compute():
+            engine = ComponentCentrality(k=k, n_jobs=n_jobs, seed=seed, precision=precision)
+            values = engine.compute(self._adjacency())
+            print(
+                f'Componentes: {engine.num_components_} '
+                f'({engine.num_trivial_} resueltas analíticamente, {engine.num_batches_} lotes)'
+            )
+            return values
+
+        params = {'k': k, 'seed': seed, 'precision': precision}
+        return self._cached('centrality_components', params, compute)
+
+    def spectral(self, kind='eigenvector', previous=None, alpha=None, tol=1e-6, max_iter=1000):
+        """
+        Centralidad espectral (eigenvector, PageRank o Katz) por iteración de potencias
+        dispersa. Si la medida no converge se devuelve PageRank en su lugar, y la
+        telemetría queda en self.spectral_telemetry.
+        :param kind: 'eigenvector', 'pagerank' o 'katz'.
+        :param previous: Resultado anterior (nodo -> valor) usado como vector inicial.
+        :param alpha: Amortiguación de PageRank o atenuación de Katz.
+        :return: Diccionario nodo -> centralidad.
+        """
+        return self._as_dict(self._spectral_values(kind, previous, alpha, tol, max_iter))
+
+    def _spectral_values(
+        self, kind='eigenvector', previous=None, alpha=None, tol=1e-6, max_iter=1000
+    ):
+        values, self.spectral_telemetry = self._spectral_run(kind, previous, alpha, tol, max_iter)
+        return values
+
+    def _spectral_run(self, kind='eigenvector', previous=None, alpha=None, tol=1e-6, max_iter=1000):
+        """
+        Centralidad espectral y su telemetría. Sin resultado previo pasa por la caché; con
+        él no, porque el vector inicial cambia la telemetría.
+        :return: (valores, telemetría)
+        """
+
+        def compute():
+            x0 = None
+            if isinstance(previous, dict):
+                x0 = np.array([previous.get(node, 0.0) for node in self.arrays.nodes.tolist()])
+            elif previous is not None:
+                x0 = np.asarray(previous)
+            engine = SpectralEngine(tol=tol, max_iter=max_iter)
+            values = engine.compute(self._adjacency(), kind=kind, x0=x0, alpha=alpha)
+            return values, engine.telemetry()
+
+        if previous is None:
+            params = {'kind': kind, 'alpha': alpha, 'tol': tol, 'max_iter': max_iter}
+            values, telemetry = self._cached('centrality_spectral', params, compute)
+        else:
+            values, telemetry = compute()
+        if telemetry['fallback_from'] is not None:
+            print(
+                f'La centralidad {kind} no convergió en {max_iter} iteraciones; '
+                f'se usa {telemetry["kind"]} en su lugar.'
+            )
+        return values, telemetry
+
+    def closeness(self, method='auto', precision=8, harmonic=False, seed=42):
+        """
+        Cercanía (o centralidad armónica) con distancias entrantes, como networkx. En
+        grafos grandes se aproxima con contadores HyperLogLog (HyperBall) en lugar de un
+        BFS por nodo.
+        :param method: 'exact', 'hyperball' o 'auto' (exacto en grafos pequeños).
+        :param precision: log2 de registros por contador (más precisión, más memoria).
+        :param harmonic: Calcula la centralidad armónica en lugar de la cercanía.
+        :return: Diccionario nodo -> cercanía.
+        """
+        return self._as_dict(self._closeness_values(method, precision, harmonic, seed))
+
+    def _closeness_values(self, method='auto', precision=8, harmonic=False, seed=42):
+        params = {'method': method, 'precision': precision, 'harmonic': harmonic, 'seed': seed}
+        return self._cached(
+            'centrality_closeness',
+            params,
+            lambda: ClosenessEngine(method=method, precision=precision, seed=seed).compute(
+                self._adjacency(), harmonic=harmonic
+            ),
+        )
+
+    def betweenness(self, k=500, seed=42, epsilon=None, n_jobs=None):
+        """
+        Intermediación aproximada por pivotes, calculada en paralelo sobre la matriz CSR
+        compartida (equivale a nx.betweenness_centrality normalizada; exacta si k >= n).
+        :return: Diccionario nodo -> intermediación.
+        """
+        return self._as_dict(self._betweenness_values(k, seed, epsilon, n_jobs))
+
+    def _betweenness_values(self, k=500, seed=42, epsilon=None, n_jobs=None):
+        def compute():
+            engine = BetweennessEngine(k=k, epsilon=epsilon, n_jobs=n_jobs, seed=seed)
+            values = engine.compute(self._adjacency())
+            if epsilon is not None:
+                print(
+                    f'Intermediación: {engine.samples_} caminos muestreados '
+                    f'(diámetro <= {engine.vertex_diameter_} nodos), '
+                    f'error <= {epsilon} con probabilidad {1 - engine.delta:.2f}'
+                )
+            return values
+
+        # n_jobs no cambia el resultado, así que no forma parte de la clave
+        params = {'k': k, 'seed': seed, 'epsilon': epsilon}
+        return self._cached('centrality_betweenness', params, compute)
 
     def density(self):
         """
         Calcula la densidad del grafo global.
         :return: Valor de densidad.
         """
-        return nx.density(self.G)
+        return self._cached('density', None, lambda: nx.density(self.G))
 
-    def modularity(self):
+    def modularity(self, resolution=1.0, seed=42, previous=None, changed_nodes=None, reduce=None):
         """
-        Detecta subcomunidades en el grafo utilizando el algoritmo de comunidades de Louvain.
+        Detecta subcomunidades con el motor de comunidades sobre arreglos (Louvain con
+        refinamiento de Leiden); con la misma semilla y resolución produce la misma
+        partición que BasicAnalyzer.detect_communities.
+        :param resolution: Parámetro de resolución de la modularidad.
+        :param seed: Semilla del orden de visita de los nodos.
+        :param previous: Partición previa (dict nodo -> comunidad, p. ej. el 'partition' de una
+            ejecución anterior) usada como asignación inicial.
+        :param changed_nodes: Nodos cuyo vecindario cambió desde la partición previa.
+        :param reduce: None, 'leaves' o 'core': detecta sobre el grafo reducido por colapso
+            de hojas (ver GraphReduction) y expande la partición.
         :return: Diccionario con la comunidad asignada a cada nodo y estadísticas adicionales.
         """
-        try:
-            from community import community_louvain
-        except ImportError:
-            raise ImportError(
-                "Se requiere el paquete 'python-louvain' para calcular la modularidad."
+        if previous is None:
+            membership, score, delta = self._cached(
+                'communities_engine',
+                {'resolution': resolution, 'seed': seed, 'reduce': reduce},
+                lambda: self._fit_communities(resolution, seed, reduce=reduce),
             )
-
-        # Convertir el grafo a no dirigido si es necesario
-        if self.G.is_directed():
-            undirected_graph = self.G.to_undirected()
         else:
-            undirected_graph = self.G
+            membership, score, delta = self._fit_communities(
+                resolution, seed, previous, changed_nodes, reduce
+            )
 
-        partition = community_louvain.best_partition(undirected_graph, random_state=42)
-        num_communities = len(set(partition.values()))
+        partition = dict(zip(self.arrays.nodes.tolist(), membership.tolist()))
+        num_communities = int(membership.max()) + 1 if len(membership) else 0
         avg_community_size = len(self.G.nodes) / num_communities if num_communities > 0 else 0
 
         return {
             'partition': partition,
             'num_communities': num_communities,
             'avg_community_size': avg_community_size,
+            'modularity': score,
+            'modularity_delta': delta,
         }
 
-    def compare_platforms(self, dataset):
+    def _fit_communities(self, resolution, seed, previous=None, changed_nodes=None, reduce=None):
+        engine = CommunityEngine(resolution=resolution, seed=seed)
+        reduction = None if reduce is None else self.arrays.reduction(reduce)
+        initial, changed = None, None
+        if previous is not None:
+            initial = initial_membership(self.arrays.index, previous)
+            if changed_nodes is not None:
+                index = self.arrays.index
+                changed = [index[node] for node in changed_nodes if node in index]
+        membership = engine.fit(
+            self.arrays.undirected(), initial=initial, changed=changed, reduction=reduction
+        )
+        return membership, engine.modularity_, engine.modularity_delta_
+
+    def compare_platforms(self, dataset, clustering='exact', samples=10000, seed=42):
         """
         Compara métricas básicas entre plataformas en el grafo y el dataset.
+        Cada nodo recibe el código de su plataforma en un arreglo (desde el almacén de
+        atributos o, sin él, desde las columnas 'Nodo' y 'Plataforma' del dataset, sin
+        escribir en el grafo); las aristas se recorren una sola vez y las métricas se
+        agregan por código, sin construir subgrafos.
         :param dataset: DataFrame con las capturas.
+        :param clustering: 'exact' o 'sampled' (muestreo de caminos de longitud 2, con
+            intervalo de confianza en '<clave>_ci'). El muestreo estima el clustering no
+            dirigido, así que en grafos dirigidos se informa como
+            'average_clustering_undirected' en lugar de 'average_clustering' (Fagiolo).
+        :param samples: Nodos muestreados por plataforma en el modo 'sampled'.
         :return: Diccionario con métricas comparativas por plataforma.
         """
-        self.validate_graph_attributes(dataset)
-
-        # Métricas por plataforma
-        platforms = dataset['Plataforma'].unique()
-        metrics = {}
+        platforms = list(dataset['Plataforma'].unique())
+        codes = self._platform_codes(platforms, dataset)
+        k = len(platforms)
+        arrays = self.arrays
 
-        for platform in platforms:
-            # Filtrar nodos del grafo que pertenecen a la plataforma
-            nodes_in_platform = [
-                node for node, data in self.G.nodes(data=True) if data.get('Plataforma') == platform
-            ]
+        # Una pasada por las aristas: solo cuentan las internas a una plataforma
+        src, dst = arrays.src, arrays.dst
+        internal = (codes[src] == codes[dst]) & (codes[src] >= 0)
+        num_nodes = np.bincount(codes[codes >= 0], minlength=k)
+        num_edges = np.bincount(codes[src[internal]], minlength=k)
 
-            # Crear subgrafo basado en nodos
-            subgraph = self.G.subgraph(nodes_in_platform).copy()
+        # Matriz diagonal por bloques: el clustering de cada nodo solo ve su plataforma
+        directed = self.G.is_directed()
+        A = arrays.incidence(src[internal], dst[internal])
+        if not directed:
+            A = A + A.T
+        if clustering == 'sampled':
+            average, lower, upper = sampled_average_clustering(
+                A, samples=samples, directed=directed, groups=codes, seed=seed
+            )
+        elif clustering == 'exact':
+            local = self._local_clustering(A)
+            valid = codes >= 0
+            num_members = np.maximum(num_nodes, 1)
+            average = np.bincount(codes[valid], weights=local[valid], minlength=k) / num_members
+        else:
+            raise ValueError(f'Método de clustering no soportado: {clustering}')
 
+        key = self._clustering_key(clustering)
+        metrics = {}
+        for code, platform in enumerate(platforms):
+            n, m = int(num_nodes[code]), int(num_edges[code])
+            possible = n * (n - 1) if self.G.is_directed() else n * (n - 1) / 2
             metrics[platform] = {
-                'num_nodes': subgraph.number_of_nodes(),
-                'num_edges': subgraph.number_of_edges(),
-                'average_clustering': nx.average_clustering(subgraph)
-                if subgraph.number_of_nodes() > 0
-                else 0,
-                'density': nx.density(subgraph),
+                'num_nodes': n,
+                'num_edges': m,
+                key: float(average[code]) if n > 0 else 0,
+                'density': m / possible if possible > 0 else 0,
             }
+            if clustering == 'sampled':
+                metrics[platform][f'{key}_ci'] = (float(lower[code]), float(upper[code]))
 
         return metrics
 
-    def capture_classification_metrics(self, y_true, y_pred):
+    def _clustering_key(self, method):
+        """
+        Clave del clustering medio: el modo muestreado mide el grafo no dirigido
+        subyacente, que en grafos dirigidos no es la misma magnitud que el exacto.
+        """
+        if method == 'sampled' and self.G.is_directed():
+            return 'average_clustering_undirected'
+        return 'average_clustering'
+
+    def _local_clustering(self, A):
+        """
+        Clustering exacto por nodo: definición dirigida de networkx (Fagiolo) en grafos
+        dirigidos; triángulos con orientación por grado en no dirigidos.
+        """
+        if self.G.is_directed():
+            return local_clustering(A, directed=True)
+        return clustering_from_triangles(A)
+
+    def clustering(self, method='exact', samples=10000, confidence=0.95, seed=42):
+        """
+        Clustering medio y global (transitividad) del grafo.
+        :param method: 'exact' (conteo de triángulos con matrices dispersas) o 'sampled'
+            (muestreo de caminos de longitud 2, para grafos grandes). El modo muestreado
+            estima el clustering medio del grafo no dirigido subyacente; en grafos
+            dirigidos lo devuelve como 'average_clustering_undirected'.
+        :param samples: Muestras de cada estimador.
+        :param confidence: Nivel de confianza de los intervalos del modo 'sampled'.
+        :return: Diccionario con el clustering medio y 'transitivity' (y sus intervalos
+            '_ci' en el modo muestreado).
+        """
+        directed = self.G.is_directed()
+        A = self._adjacency()
+        if method == 'exact':
+            return {
+                'average_clustering': float(self._local_clustering(A).mean())
+                if A.shape[0]
+                else 0.0,
+                'transitivity': transitivity(A, directed=directed),
+            }
+        if method != 'sampled':
+            raise ValueError(f'Método de clustering no soportado: {method}')
+        average, avg_low, avg_high = sampled_average_clustering(
+            A, samples=samples, confidence=confidence, directed=directed, seed=seed
+        )
+        global_, global_low, global_high = sampled_transitivity(
+            A, samples=samples, confidence=confidence, directed=directed, seed=seed
+        )
+        key = self._clustering_key(method)
+        return {
+            key: average,
+            f'{key}_ci': (avg_low, avg_high),
+            'transitivity': global_,
+            'transitivity_ci': (global_low, global_high),
+        }
+
+    def _platform_codes(self, platforms, dataset):
+        """
+        Arreglo nodo -> código de plataforma (posición en `platforms`, -1 si ninguna),
+        alineado con self.arrays.nodes.
+        """
+        index = self.arrays.index
+        codes = np.full(len(index), -1, dtype=np.int64)
+        if self.attrs is not None:
+            for code, platform in enumerate(platforms):
+                members = self.attrs.members(tipo=('Usuario', 'Captura'), plataforma=platform)
+                positions = [index[node] for node in members if node in index]
+                codes[positions] = code
+            return codes
+
+        if 'Nodo' not in dataset.columns or 'Plataforma' not in dataset.columns:
+            raise ValueError("El dataset debe contener las columnas 'Nodo' y 'Plataforma'.")
+        lookup = {platform: code for code, platform in enumerate(platforms)}
+        for node, platform in zip(dataset['Nodo'], dataset['Plataforma']):
+            position = index.get(node)
+            if position is not None:
+                codes[position] = lookup[platform]
+        return codes
+
+    def capture_classification_metrics(self, y_true=None, y_pred=None, chunks=None):
         """
-        Calcula métricas de clasificación como precisión, recall y F1.
+        Calcula métricas de clasificación como precisión, recall y F1 (ponderadas por
+        soporte, como average='weighted') junto con sus versiones macro y la exactitud,
+        todas a partir de una única matriz de confusión acumulada.
         :param y_true: Etiquetas reales.
         :param y_pred: Etiquetas predichas.
+        :param chunks: Alternativa a y_true/y_pred: iterable de bloques (y_true, y_pred)
+            o una ConfusionMatrix ya acumulada (p. ej. fusionada desde varios procesos).
         :return: Diccionario con métricas de precisión, recall y F1.
         """
-        precision = precision_score(y_true, y_pred, average='weighted')
-        recall = recall_score(y_true, y_pred, average='weighted')
-        f1 = f1_score(y_true, y_pred, average='weighted')
+        if isinstance(chunks, ConfusionMatrix):
+            confusion = chunks
+        elif chunks is not None:
+            confusion = ConfusionMatrix.from_chunks(chunks)
+        elif y_true is not None and y_pred is not None:
+            confusion = ConfusionMatrix().update(y_true, y_pred)
+        else:
+            raise ValueError('Se necesitan y_true e y_pred o bloques de etiquetas.')
+        return confusion.metrics()
+
+    def degree_centrality(self):
+        """
+        Centralidad de grado (equivalente a nx.degree_centrality) desde los arreglos.
+        :return: Diccionario nodo -> centralidad de grado.
+        """
+        arrays = self.arrays
+        return dict(zip(arrays.nodes.tolist(), arrays.degree_centrality().tolist()))
 
-        return {'precision': precision, 'recall': recall, 'f1': f1}
+    def _prepare_arrays(self):
+        """
+        Construye los arreglos y matrices compartidos antes de repartir etapas, para que
+        los procesos trabajadores los hereden en lugar de recalcularlos.
+        """
+        self.arrays.fingerprint()
+        self._adjacency()
+        self.arrays.undirected()
 
-    def analyze(self, dataset, y_true=None, y_pred=None):
+    def _stage_calls(self, dataset, y_true, y_pred):
+        """
+        Etapas de analyze: nombre -> (función, etapas de las que depende, coste relativo).
+        """
+        return {
+            'arrays': (self._prepare_arrays, (), 0),
+            'classification': (lambda **kw: self.classify_captures(dataset), (), 1),
+            'platform_comparison': (
+                lambda **kw: self.compare_platforms(dataset, **kw),
+                ('arrays',),
+                3,
+            ),
+            'degree': (lambda **kw: self.arrays.degree_centrality(), ('arrays',), 1),
+            'closeness': (lambda **kw: self._closeness_values(**kw), ('arrays',), 5),
+            'betweenness': (lambda **kw: self._betweenness_values(**kw), ('arrays',), 10),
+            # Devuelve (valores, telemetría): en un trabajador, el atributo no llegaría
+            'eigenvector': (
+                lambda **kw: self._spectral_run('eigenvector', **kw),
+                ('arrays',),
+                3,
+            ),
+            'density': (lambda **kw: self.density(), (), 0),
+            'modularity': (lambda **kw: self.modularity(**kw), ('arrays',), 5),
+            'classification_metrics': (
+                lambda **kw: self.capture_classification_metrics(y_true, y_pred),
+                (),
+                1,
+            ),
+        }
+
+    def analyze(
+        self,
+        dataset,
+        y_true=None,
+        y_pred=None,
+        metrics=None,
+        parallel=True,
+        max_workers=None,
+        options=None,
+        as_arrays=False,
+        trace_memory=False,
+    ):
         """
         Llama a los métodos de análisis y los combina en un resultado.
+        Cada métrica es una etapa: las etapas costosas independientes se ejecutan a la vez
+        en procesos trabajadores (que heredan el grafo y sus arreglos ya construidos), las
+        baratas en el proceso principal y la intermediación, que reparte sus pivotes en su
+        propio pool, también en el principal con los núcleos que quedan libres. De cada
+        etapa se informa en result['stages'] el tiempo de reloj y el pico de memoria
+        residente que añadió al proceso que la ejecutó (ver _measure); la de
+        'eigenvector' incluye además la telemetría de la iteración.
         :param dataset: DataFrame con las capturas.
         :param y_true: Etiquetas reales para clasificación de capturas (opcional).
         :param y_pred: Etiquetas predichas para clasificación de capturas (opcional).
+        :param metrics: Métricas a calcular (por defecto, todas): 'classification',
+            'platform_comparison', 'degree', 'closeness', 'betweenness', 'eigenvector',
+            'density', 'modularity' y 'classification_metrics'.
+        :param parallel: Ejecuta las etapas en un pool de procesos (requiere el método de
+            arranque 'fork'; en otro caso se ejecutan en serie).
+        :param max_workers: Número de procesos del pool (por defecto, todos los núcleos).
+        :param options: Parámetros por etapa, p. ej. {'betweenness': {'k': 1000}}.
+        :param as_arrays: Devuelve result['centrality'] como CentralityResult (arreglos)
+            en lugar de diccionarios por nodo.
+        :param trace_memory: Mide además con tracemalloc la memoria reservada por cada
+            etapa (más preciso, pero ralentiza mucho las etapas escritas en Python).
         :return: Diccionario con resultados del análisis profundo.
         """
-        classification = self.classify_captures(dataset)
-        platform_comparison = self.compare_platforms(dataset)
-        centrality = self.centrality_metrics()
-        density = self.density()
-        modularity = self.modularity()
-
-        result = {
-            'classification': classification,
-            'platform_comparison': platform_comparison,
-            'centrality': centrality,
-            'density': density,
-            'modularity': modularity,
-        }
+        stages = self._stage_calls(dataset, y_true, y_pred)
+        available = [name for name in stages if name != 'arrays']
+        if metrics is None:
+            metrics = [name for name in available if name != 'classification_metrics']
+            if y_true is not None and y_pred is not None:
+                metrics.append('classification_metrics')
+        unknown = set(metrics) - set(available)
+        if unknown:
+            raise ValueError(f'Métricas no soportadas: {sorted(unknown)}')
+        if 'classification_metrics' in metrics and (y_true is None or y_pred is None):
+            raise ValueError("'classification_metrics' requiere y_true e y_pred.")
 
-        if y_true is not None and y_pred is not None:
-            classification_metrics = self.capture_classification_metrics(y_true, y_pred)
-            result['classification_metrics'] = classification_metrics
+        selected = set(metrics)
+        for name in metrics:
+            selected.update(stages[name][1])
+        parallel = parallel and 'fork' in multiprocessing.get_all_start_methods()
+        values, report = run_stages(
+            {name: stages[name] for name in selected},
+            options or {},
+            parallel,
+            max_workers,
+            own_pool=('betweenness',),
+            trace_memory=trace_memory,
+        )
 
+        if 'eigenvector' in values:
+            values['eigenvector'], self.spectral_telemetry = values['eigenvector']
+            report['eigenvector']['telemetry'] = self.spectral_telemetry
+
+        result = {}
+        measures = ('degree', 'closeness', 'betweenness', 'eigenvector')
+        centrality = {name: values[name] for name in metrics if name in measures}
+        for name in metrics:
+            if name not in measures:
+                result[name] = values[name]
+        if centrality:
+            centrality = self.centrality_result(centrality)
+            if not as_arrays:
+                centrality = {
+                    f'{measure}_centrality': centrality.to_dict(measure)
+                    for measure in centrality.measures
+                }
+            result['centrality'] = centrality
+        result['stages'] = report
         return result
+
+
+# Analizador heredado por los procesos trabajadores de analyze
+_STAGE_ANALYZER = {}
+
+
+def _init_stage_worker(stage_calls):
+    _STAGE_ANALYZER['stages'] = stage_calls
+
+
+def _run_stage_worker(name, kwargs, trace_memory):
+    return _measure(partial(_STAGE_ANALYZER['stages'][name][0], **kwargs), trace_memory)
+
+
+def _current_rss():
+    """
+    Memoria residente actual del proceso en bytes (/proc/self/statm); None donde no hay
+    /proc (Windows, macOS).
+    """
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class _RSSMonitor:
+    """
+    Muestrea en un hilo la memoria residente del proceso mientras corre una etapa;
+    peak_mb es el mayor incremento sobre la memoria al empezar (pico propio de la
+    etapa, no el máximo histórico del proceso).
+    """
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak_mb = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def __enter__(self):
+        self._start = _current_rss()
+        if self._start is not None:
+            self._peak = self._start
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+        return self
+
+    def _sample(self):
+        current = _current_rss()
+        if current is not None:
+            self._peak = max(self._peak, current)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __exit__(self, *exc):
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._sample()
+            self.peak_mb = (self._peak - self._start) / 2**20
+        return False
+
+
+def _measure(func, trace_memory=False):
+    """
+    Ejecuta func midiendo el tiempo de reloj y el pico de memoria residente que añade la
+    etapa al proceso que la ejecuta (muestreado cada 10 ms; no incluye los procesos que
+    abra la etapa, y es None sin /proc). Con trace_memory mide también el pico de memoria
+    reservada por la etapa con tracemalloc, que ralentiza mucho el código Python.
+    """
+    started = False
+    if trace_memory:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        else:
+            tracemalloc.reset_peak()
+        baseline = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    monitor = _RSSMonitor()
+    try:
+        with monitor:
+            value = func()
+    finally:
+        report = {'wall_time': time.perf_counter() - start, 'peak_rss_mb': monitor.peak_mb}
+        if trace_memory:
+            peak = tracemalloc.get_traced_memory()[1] - baseline
+            report['peak_traced_mb'] = max(peak, 0) / 2**20
+        if started:
+            tracemalloc.stop()
+    return value, report
+
+
+def run_stages(
+    stages,
+    options,
+    parallel,
+    max_workers=None,
+    inline_cost=1,
+    own_pool=(),
+    trace_memory=False,
+):
+    """
+    Ejecuta un grafo de etapas por oleadas: en cada oleada corren a la vez todas las
+    etapas cuyas dependencias ya terminaron. Solo van al pool de procesos las etapas de
+    coste mayor que inline_cost; las baratas (y 'arrays', cuyo efecto es dejar listos
+    los arreglos compartidos) se ejecutan en el proceso principal mientras el pool
+    trabaja, igual que las de own_pool, que paralelizan por su cuenta y reciben como
+    n_jobs los núcleos que no usa el pool.
+    :param stages: Diccionario nombre -> (función, dependencias, coste relativo).
+    :return: (valores por etapa, informe de tiempo y memoria por etapa)
+    """
+    workers = max_workers or os.cpu_count() or 1
+    values, report = {}, {}
+    pending = dict(stages)
+    while pending:
+        ready = [name for name, stage in pending.items() if set(stage[1]) <= set(values)]
+        if not ready:
+            raise ValueError(f'Dependencias circulares entre etapas: {sorted(pending)}')
+        heavy = [
+            name
+            for name in ready
+            if name != 'arrays' and name not in own_pool and pending[name][2] > inline_cost
+        ]
+        has_own_pool = any(name in own_pool for name in ready)
+        remote = heavy if parallel and (len(heavy) > 1 or has_own_pool) else []
+        local = [name for name in ready if name not in remote]
+
+        executor, futures = None, {}
+        if remote:
+            # Con 'fork' los trabajadores heredan las funciones de las etapas sin serializarlas
+            executor = ProcessPoolExecutor(
+                max_workers=min(workers, len(remote)),
+                mp_context=multiprocessing.get_context('fork'),
+                initializer=_init_stage_worker,
+                initargs=(stages,),
+            )
+        try:
+            for name in remote:
+                futures[name] = executor.submit(
+                    _run_stage_worker, name, options.get(name, {}), trace_memory
+                )
+            for name in local:
+                kwargs = dict(options.get(name, {}))
+                if parallel and name in own_pool:
+                    kwargs.setdefault('n_jobs', max(1, workers - len(remote)))
+                func = partial(pending[name][0], **kwargs)
+                values[name], report[name] = _measure(func, trace_memory)
+            for name, future in futures.items():
+                values[name], report[name] = future.result()
+        finally:
+            if executor is not None:
+                executor.shutdown()
+        for name in ready:
+            del pending[name]
+    return values, report
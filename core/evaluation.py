@@ -0,0 +1,116 @@
+# core/evaluation.py
+import numpy as np
+import pandas as pd
+
+
+class ConfusionMatrix:
+    """
+    Matriz de confusión acumulable por bloques: las etiquetas se codifican como enteros
+    (el diccionario crece con las etiquetas nuevas) y cada bloque se cuenta con un único
+    bincount. Dos matrices se pueden fusionar (p. ej. las de distintos procesos) y todas
+    las métricas ponderadas y macro salen de la misma matriz, sin guardar las etiquetas.
+    Filas = etiqueta real, columnas = etiqueta predicha.
+    """
+
+    def __init__(self, labels=None):
+        """
+        :param labels: Etiquetas conocidas de antemano (opcional); fija su orden.
+        """
+        self.labels = []
+        self._codes = {}
+        self.matrix = np.zeros((0, 0), dtype=np.int64)
+        if labels is not None:
+            self._encode_labels(labels)
+
+    @classmethod
+    def from_chunks(cls, chunks, labels=None):
+        """
+        Acumula una secuencia de bloques (y_true, y_pred).
+        """
+        confusion = cls(labels)
+        for y_true, y_pred in chunks:
+            confusion.update(y_true, y_pred)
+        return confusion
+
+    def _encode_labels(self, labels):
+        for label in labels:
+            if label not in self._codes:
+                self._codes[label] = len(self.labels)
+                self.labels.append(label)
+        k = len(self.labels)
+        if self.matrix.shape[0] < k:
+            grown = np.zeros((k, k), dtype=np.int64)
+            size = self.matrix.shape[0]
+            grown[:size, :size] = self.matrix
+            self.matrix = grown
+
+    def update(self, y_true, y_pred):
+        """
+        Suma un bloque de etiquetas reales y predichas.
+        """
+        y_true = np.asarray(y_true, dtype=object)
+        y_pred = np.asarray(y_pred, dtype=object)
+        if len(y_true) != len(y_pred):
+            raise ValueError('y_true e y_pred deben tener la misma longitud.')
+        if len(y_true) == 0:
+            return self
+        codes, uniques = pd.factorize(np.concatenate([y_true, y_pred]))
+        if (codes < 0).any():
+            raise ValueError('Las etiquetas no pueden ser nulas.')
+        self._encode_labels(uniques)
+        # Traduce los códigos del bloque a los códigos globales
+        lookup = np.array([self._codes[label] for label in uniques], dtype=np.int64)
+        codes = lookup[codes]
+        k = len(self.labels)
+        true_codes, pred_codes = codes[: len(y_true)], codes[len(y_true) :]
+        counts = np.bincount(true_codes * k + pred_codes, minlength=k * k)
+        self.matrix += counts.reshape(k, k)
+        return self
+
+    def merge(self, other):
+        """
+        Suma otra matriz de confusión, alineando sus etiquetas con las propias.
+        """
+        self._encode_labels(other.labels)
+        positions = np.array([self._codes[label] for label in other.labels], dtype=np.int64)
+        if len(positions):
+            self.matrix[np.ix_(positions, positions)] += other.matrix
+        return self
+
+    def __iadd__(self, other):
+        return self.merge(other)
+
+    @property
+    def total(self):
+        return int(self.matrix.sum())
+
+    def per_class(self):
+        """
+        Precisión, recall, F1 y soporte de cada etiqueta (0 cuando el denominador es 0,
+        como zero_division=0 en scikit-learn).
+        """
+        tp = np.diag(self.matrix).astype(np.float64)
+        predicted = self.matrix.sum(axis=0)
+        support = self.matrix.sum(axis=1)
+        precision = np.divide(tp, predicted, out=np.zeros(len(tp)), where=predicted > 0)
+        recall = np.divide(tp, support, out=np.zeros(len(tp)), where=support > 0)
+        denominator = precision + recall
+        f1 = np.divide(
+            2 * precision * recall, denominator, out=np.zeros(len(tp)), where=denominator > 0
+        )
+        return {'precision': precision, 'recall': recall, 'f1': f1, 'support': support}
+
+    def metrics(self):
+        """
+        Métricas ponderadas por soporte (las de average='weighted'), macro y exactitud.
+        """
+        scores = self.per_class()
+        support = scores['support']
+        total = support.sum()
+        result = {}
+        for name in ('precision', 'recall', 'f1'):
+            values = scores[name]
+            result[name] = float(values @ support / total) if total > 0 else 0.0
+            result[f'macro_{name}'] = float(values.mean()) if len(values) else 0.0
+        result['accuracy'] = float(np.trace(self.matrix) / total) if total > 0 else 0.0
+        return result
@@ -0,0 +1,148 @@
+# core/graph_arrays.py
+import hashlib
+
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+
+def top_k_indices(values, k):
+    """
+    Índices de los k mayores valores en orden descendente, con selección parcial
+    (argpartition) en lugar de ordenar todo el arreglo. Los empates se resuelven por
+    posición, igual que un ordenamiento estable.
+    """
+    values = np.asarray(values)
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    if k >= len(values):
+        return np.argsort(-values, kind='stable')
+    candidates = np.argpartition(-values, k - 1)[:k]
+    threshold = values[candidates].min()
+    above = np.flatnonzero(values > threshold)
+    ties = np.flatnonzero(values == threshold)[: k - len(above)]
+    selected = np.concatenate([above, ties])
+    return selected[np.lexsort((selected, -values[selected]))]
+
+
+class GraphArrays:
+    """
+    Representación en arreglos enteros de un grafo de networkx: un índice nodo -> entero
+    y las aristas como pares (origen, destino) con el tipo de arista codificado.
+    Las matrices dispersas derivadas se construyen bajo demanda y se reutilizan.
+    """
+
+    def __init__(self, G):
+        self.directed = G.is_directed()
+        self.nodes = np.empty(G.number_of_nodes(), dtype=object)
+        self.nodes[:] = list(G.nodes)
+        self.index = {node: i for i, node in enumerate(self.nodes)}
+
+        num_edges = G.number_of_edges()
+        index = self.index
+        edges = G.edges(data='tipo')
+        self.src = np.fromiter((index[u] for u, _, _ in edges), dtype=np.int64, count=num_edges)
+        self.dst = np.fromiter((index[v] for _, v, _ in edges), dtype=np.int64, count=num_edges)
+        self.edge_tipo = pd.Categorical([tipo for _, _, tipo in edges])
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.nodes)
+
+    @property
+    def num_edges(self):
+        return len(self.src)
+
+    def fingerprint(self):
+        """
+        Huella del contenido del grafo (SHA-256 de los IDs de nodo, las aristas y sus
+        tipos); dos grafos con el mismo contenido y orden producen la misma huella, se hayan
+        construido o cargado como sea. No puede quedar obsoleta: GraphViews reconstruye los
+        arreglos cuando cambia la revisión del grafo.
+        """
+        if 'fingerprint' not in self._cache:
+            digest = hashlib.sha256()
+            digest.update(str(self.directed).encode())
+            digest.update('\n'.join(map(repr, self.nodes)).encode('utf-8'))
+            digest.update(self.src.tobytes())
+            digest.update(self.dst.tobytes())
+            digest.update(repr(list(self.edge_tipo.categories)).encode('utf-8'))
+            digest.update(np.asarray(self.edge_tipo.codes).tobytes())
+            self._cache['fingerprint'] = digest.hexdigest()
+        return self._cache['fingerprint']
+
+    def degree(self):
+        """
+        Grado total (entrada + salida) de cada nodo como arreglo, en el orden de `nodes`.
+        """
+        if 'degree' not in self._cache:
+            n = len(self)
+            self._cache['degree'] = np.bincount(self.src, minlength=n) + np.bincount(
+                self.dst, minlength=n
+            )
+        return self._cache['degree']
+
+    def degree_centrality(self):
+        """
+        Centralidad de grado normalizada por n - 1, equivalente a nx.degree_centrality.
+        """
+        n = len(self)
+        if n <= 1:
+            return np.ones(n)
+        return self.degree() / (n - 1)
+
+    def edge_arrays(self, tipo=None):
+        """
+        Pares (origen, destino) de las aristas, opcionalmente solo las de un tipo.
+        """
+        if tipo is None:
+            return self.src, self.dst
+        mask = np.asarray(self.edge_tipo == tipo)
+        return self.src[mask], self.dst[mask]
+
+    def incidence(self, rows, cols, shape=None, weights=None):
+        """
+        Matriz CSR con un 1 (o el peso dado) por cada par (fila, columna); los pares
+        repetidos se suman.
+        """
+        n = len(self)
+        shape = (n, n) if shape is None else shape
+        data = np.ones(len(rows)) if weights is None else weights
+        return sp.csr_matrix((data, (rows, cols)), shape=shape)
+
+    def undirected(self):
+        """
+        Matriz simétrica no ponderada equivalente a G.to_undirected(): cada par conectado
+        (en cualquier sentido) vale 1 y los lazos se guardan como 2 en la diagonal.
+        """
+        if 'undirected' not in self._cache:
+            loop = self.src == self.dst
+            src, dst = self.src[~loop], self.dst[~loop]
+            A = self.incidence(np.concatenate([src, dst]), np.concatenate([dst, src]))
+            A.data[:] = 1.0
+            if loop.any():
+                has_loop = np.bincount(self.src[loop], minlength=len(self)) > 0
+                A = A + sp.diags(has_loop * 2.0)
+            self._cache['undirected'] = A.tocsr()
+        return self._cache['undirected']
+
+    def adjacency(self, tipo=None):
+        """
+        Matriz de adyacencia dirigida (CSR), opcionalmente restringida a un tipo de arista.
+        """
+        key = ('adjacency', tipo)
+        if key not in self._cache:
+            src, dst = self.edge_arrays(tipo)
+            self._cache[key] = self.incidence(src, dst)
+        return self._cache[key]
+
+    def reduction(self, mode='leaves'):
+        """
+        Reducción por colapso de hojas (GraphReduction) de la matriz no dirigida.
+        """
+        key = ('reduction', mode)
+        if key not in self._cache:
+            from core.reduction import GraphReduction
+
+            self._cache[key] = GraphReduction(self.undirected(), mode=mode)
+        return self._cache[key]
@@ -0,0 +1,75 @@
+# core/graph_views.py
+import weakref
+
+from core.graph_arrays import GraphArrays
+
+
+class GraphViews:
+    """
+    Capa de vistas compartida por los analizadores: para cada grafo mantiene, una sola vez,
+    su representación en arreglos y sirve la versión no dirigida como vista de networkx
+    (sin copiar el grafo). Así un análisis completo no guarda más de una representación
+    adicional del grafo.
+    Las vistas se invalidan con la revisión estructural del grafo (G.graph['revision']),
+    que incrementan todos los métodos de NetworkBuilder que lo modifican; quien edite el
+    grafo a mano debe llamar a GraphViews.touch(G). Como red de seguridad, un cambio en el
+    número de nodos también invalida las vistas.
+    """
+
+    _registry = weakref.WeakKeyDictionary()
+
+    def __init__(self, G):
+        # Referencia débil: la entrada del registro no debe mantener vivo al grafo
+        self._graph = weakref.ref(G)
+        self.state = self._state(G)
+        self._arrays = None
+
+    @staticmethod
+    def revision(G):
+        """
+        Revisión estructural del grafo (0 si nunca se marcó como modificado).
+        """
+        return G.graph.get('revision', 0)
+
+    @staticmethod
+    def _state(G):
+        return GraphViews.revision(G), G.number_of_nodes()
+
+    @classmethod
+    def of(cls, G):
+        """
+        Devuelve la instancia compartida para un grafo; la (re)crea si no existe o si el
+        grafo cambió desde que se construyó.
+        """
+        views = cls._registry.get(G)
+        if views is None or views.state != cls._state(G):
+            views = cls(G)
+            cls._registry[G] = views
+        return views
+
+    @classmethod
+    def touch(cls, G):
+        """
+        Marca el grafo como modificado (llamar tras cambiar nodos o aristas): incrementa su
+        revisión y descarta las estructuras derivadas.
+        """
+        G.graph['revision'] = cls.revision(G) + 1
+        cls._registry.pop(G, None)
+
+    @property
+    def G(self):
+        return self._graph()
+
+    @property
+    def arrays(self):
+        if self._arrays is None:
+            self._arrays = GraphArrays(self.G)
+        return self._arrays
+
+    @property
+    def undirected(self):
+        """
+        Vista no dirigida del grafo (sin copia).
+        """
+        G = self.G
+        return G.to_undirected(as_view=True) if G.is_directed() else G
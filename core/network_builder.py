@@ -1,18 +1,58 @@
 # core\network_builder.py
+import numpy as np
 import pandas as pd
 import sqlite3
 import networkx as nx
 from networkx.algorithms.community import louvain_communities
 import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+from core.graph_views import GraphViews
+from core.node_store import NodeAttributeStore
+from core.projection import UserProjector
+from core.temporal_index import TemporalIndex
+
+
+def _build_platform_shard(platform, rows, ts_base_path, fb_db_path):
+    """
+    Construye en un proceso aparte el subgrafo de una plataforma (nodos, aristas PUBLICA y
+    relaciones propias). Devuelve además las aristas PUBLICA cuyo autor no está en el
+    fragmento, para resolverlas al fusionar.
+    """
+    shard = NetworkBuilder(
+        rows,
+        ts_base_path=ts_base_path if platform == 'Truth Social' else None,
+        fb_db_path=fb_db_path if platform == 'Facebook' else None,
+    )
+    shard.add_nodes()
+    shard.add_edges()
+    if shard.ts_base_path:
+        shard.add_truth_social_relationships()
+    shard.add_facebook_relationships()
+
+    capturas = rows[rows['Tipo_de_Nodo'] == 'Captura']
+    pending = [
+        (f'@{autor}', node)
+        for autor, node in zip(capturas['Autor'], capturas['Nodo'])
+        if f'@{autor}' not in shard.G
+    ]
+    return platform, shard.G, shard.attrs.frame, pending
 
 
 class NetworkBuilder:
     def __init__(self, dataset, ts_base_path=None, fb_db_path=None):
         self.dataset = dataset
         self.G = nx.DiGraph()
+        # Atributos de los nodos fuera del grafo, en formato columnar
+        self.attrs = NodeAttributeStore()
+        self._num_edges = 0
+        self._temporal = None
         self.ts_base_path = ts_base_path
         self.fb_db_path = fb_db_path
         self._cache_usernames = {}
+        # Registro de cambios incrementales: tuplas (version, operacion, nodo[, destino])
+        self.change_log = []
+        self.version = 0
 
     def _get_username_from_id(self, user_id):
         if self.ts_base_path:
@@ -23,85 +63,373 @@ class NetworkBuilder:
             return mapping.get(user_id, 'unknown_user')
         return 'unknown_user'
 
-    def add_nodes(self):
-        for _, row in self.dataset.iterrows():
-            if row['Tipo_de_Nodo'] == 'Usuario':
-                self.G.add_node(
-                    row['Nodo'], tipo='Usuario', plataforma=row['Plataforma'], username=row['Autor']
-                )
-            else:
-                self.G.add_node(
-                    row['Nodo'],
-                    tipo='Captura',
-                    plataforma=row['Plataforma'],
-                    estructura=row['Estructura'],
-                    autor=row['Autor'],
-                    fecha=row['Fecha'],
-                    contenido=row['Contenido'],
-                )
+    def _log(self, op, *items):
+        self.change_log.append((self.version, op) + items)
 
-    def add_edges(self):
-        capturas = self.dataset[self.dataset['Tipo_de_Nodo'] == 'Captura']
+    def add_nodes(self, rows=None):
+        """
+        Añade usuarios y capturas. El grafo solo guarda el tipo de cada nodo; el resto de
+        atributos se escribe en bloque en el almacén columnar `self.attrs`.
+        """
+        rows = self.dataset if rows is None else rows
+        is_user = (rows['Tipo_de_Nodo'] == 'Usuario').to_numpy()
+        tipos = ['Usuario' if user else 'Captura' for user in is_user]
+        self.G.add_nodes_from((node, {'tipo': tipo}) for node, tipo in zip(rows['Nodo'], tipos))
+        GraphViews.touch(self.G)
+
+        capture = ~is_user
+        self.attrs.add(
+            pd.DataFrame(
+                {
+                    'tipo': tipos,
+                    'plataforma': rows['Plataforma'].to_numpy(),
+                    'estructura': rows['Estructura'].where(capture).to_numpy(),
+                    'autor': rows['Autor'].to_numpy(),
+                    'fecha': rows['Fecha'].where(capture).to_numpy(),
+                    'contenido': rows['Contenido'].where(capture).to_numpy(),
+                },
+                index=rows['Nodo'].to_numpy(),
+            )
+        )
+
+    def add_edges(self, rows=None):
+        rows = self.dataset if rows is None else rows
+        capturas = rows[rows['Tipo_de_Nodo'] == 'Captura']
+        added = []
         for _, captura in capturas.iterrows():
-            autor_node = f"@{captura['Autor']}"
-            if autor_node in self.G:
+            autor_node = f'@{captura["Autor"]}'
+            if autor_node in self.G and captura['Nodo'] in self.G:
+                self._num_edges += not self.G.has_edge(autor_node, captura['Nodo'])
                 self.G.add_edge(autor_node, captura['Nodo'], tipo='PUBLICA')
+                added.append((autor_node, captura['Nodo']))
+        GraphViews.touch(self.G)
+        return added
 
     def add_truth_social_relationships(self):
         # Aquí el código que añade hashtags, menciones, etc.
         # Como ejemplo, lo dejamos igual.
         pass
 
-    def add_facebook_relationships(self):
+    def add_facebook_relationships(self, post_nodes=None, chunksize=50000):
+        """
+        Añade los comentarios de Facebook como nodos hijos de sus publicaciones.
+        Los pid muestreados se cargan en una tabla temporal de SQLite y el JOIN se resuelve
+        en la base de datos, de modo que solo se leen (por bloques) los comentarios de la muestra.
+        :param post_nodes: Conjunto opcional de publicaciones a considerar (por defecto, las
+            capturas de Facebook presentes en el grafo).
+        :param chunksize: Número de comentarios leídos por bloque.
+        :return: Lista de aristas (publicación, comentario) añadidas.
+        """
         if self.fb_db_path is None:
-            return
+            return []
+        if post_nodes is None:
+            post_nodes = [n for n in self.G if isinstance(n, str) and n.startswith('capfb')]
+        pids = [(node[len('capfb') :],) for node in post_nodes]
+        if not pids:
+            return []
+
+        added = []
         conn = sqlite3.connect(self.fb_db_path)
-        comments = pd.read_sql(
-            """
-            SELECT 
-                'comment_' || cid as comment_node,
-                'capfb' || pid as post_node,
-                id as author_id,
-                name as author_name
-            FROM comment
-            """,
-            conn,
+        try:
+            conn.execute('CREATE TEMP TABLE sampled_posts (pid TEXT PRIMARY KEY)')
+            conn.executemany('INSERT OR IGNORE INTO sampled_posts (pid) VALUES (?)', pids)
+            chunks = pd.read_sql(
+                """
+                SELECT 
+                    'comment_' || c.cid as comment_node,
+                    'capfb' || c.pid as post_node,
+                    c.id as author_id,
+                    c.name as author_name,
+                    c.timeStamp as fecha
+                FROM comment c
+                JOIN sampled_posts s ON c.pid = s.pid
+                """,
+                conn,
+                chunksize=chunksize,
+            )
+            for comments in chunks:
+                added.extend(self.add_comments(comments))
+        finally:
+            conn.close()
+        return added
+
+    def add_comments(self, comments):
+        """
+        Inserta en bloque comentarios (comment_node, post_node, author_name y, opcionalmente,
+        author_id y fecha) cuya publicación está en el grafo.
+        :return: Lista de aristas (publicación, comentario) añadidas.
+        """
+        comments = comments[[post in self.G for post in comments['post_node']]]
+        self.G.add_nodes_from(comments['comment_node'], tipo='Comentario')
+        self.attrs.add(
+            pd.DataFrame(
+                {
+                    'tipo': 'Comentario',
+                    'plataforma': 'Facebook',
+                    'autor': comments['author_name'].to_numpy(),
+                    'autor_id': (
+                        comments['author_id'].to_numpy() if 'author_id' in comments else None
+                    ),
+                    'fecha': comments['fecha'].to_numpy() if 'fecha' in comments else None,
+                },
+                index=comments['comment_node'].to_numpy(),
+            )
         )
-        conn.close()
+        edges = list(zip(comments['post_node'], comments['comment_node']))
+        self._num_edges += sum(not self.G.has_edge(u, v) for u, v in edges)
+        self.G.add_edges_from(edges, tipo='TIENE_COMENTARIO')
+        GraphViews.touch(self.G)
+        return edges
 
-        for _, comment in comments.iterrows():
-            if comment['post_node'] in self.G:
-                self.G.add_node(
-                    comment['comment_node'], tipo='Comentario', autor=comment['author_name']
-                )
-                self.G.add_edge(
-                    comment['post_node'], comment['comment_node'], tipo='TIENE_COMENTARIO'
+    def build_network(self, sharded=False, max_workers=None):
+        """
+        Construye la red completa.
+        :param sharded: Si es True, construye el subgrafo de cada plataforma en paralelo
+            (un proceso por plataforma) y fusiona los fragmentos.
+        :param max_workers: Número máximo de procesos para el modo fragmentado.
+        """
+        if sharded:
+            self._build_sharded(max_workers)
+        else:
+            self.add_nodes()
+            self.add_edges()
+            self.add_truth_social_relationships()
+            self.add_facebook_relationships()
+        # El grafo completo es la nueva línea base del registro de cambios
+        self.change_log = []
+        return self.G
+
+    def _build_sharded(self, max_workers=None):
+        groups = self.dataset.groupby('Plataforma', sort=False, dropna=False)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(
+                    _build_platform_shard, platform, rows, self.ts_base_path, self.fb_db_path
                 )
+                for platform, rows in groups
+            ]
+            shards = [future.result() for future in futures]
 
-    def build_network(self):
-        self.add_nodes()
-        self.add_edges()
-        self.add_truth_social_relationships()
-        self.add_facebook_relationships()
-        return self.G
+        # Un mismo usuario puede aparecer en varias plataformas: como en la construcción
+        # secuencial, prevalece la última fila del dataset para ese nodo
+        last = self.dataset.drop_duplicates('Nodo', keep='last')
+        owner = dict(zip(last['Nodo'], last['Plataforma']))
+        shared = set()
+        seen = set()
+        for _, shard_G, _, _ in shards:
+            shared.update(seen.intersection(shard_G))
+            seen.update(shard_G)
+
+        pending = []
+        for platform, shard_G, frame, shard_pending in shards:
+            self.G.add_nodes_from(shard_G.nodes(data=True))
+            self.G.add_edges_from(shard_G.edges(data=True))
+            if shared:
+                keep = [node not in shared or owner.get(node) == platform for node in frame.index]
+                frame = frame[keep]
+            self.attrs.add(frame)
+            pending.extend(shard_pending)
+        for node in shared:
+            self.G.nodes[node]['tipo'] = self.attrs.get(node)['tipo']
+
+        # Aristas PUBLICA entre autores y capturas de fragmentos distintos
+        self.G.add_edges_from(
+            ((autor, node) for autor, node in pending if autor in self.G), tipo='PUBLICA'
+        )
+        self._num_edges = self.G.number_of_edges()
+        GraphViews.touch(self.G)
+
+    def _remove_node(self, node):
+        for u, v in list(self.G.in_edges(node)) + list(self.G.out_edges(node)):
+            self._log('remove_edge', u, v)
+        self._num_edges -= self.G.degree(node)
+        self.G.remove_node(node)
+        GraphViews.touch(self.G)
+        self._log('remove_node', node)
+
+    def apply_delta(self, added=None, removed=None, comments=None):
+        """
+        Aplica un delta del dataset sobre el grafo existente (p. ej. cargado desde cache)
+        sin reconstruirlo, dejando el mismo resultado que un build_network completo.
+        :param added: DataFrame con filas nuevas (mismo esquema que el dataset).
+        :param removed: DataFrame o iterable con los 'Nodo' a eliminar.
+        :param comments: DataFrame opcional con comentarios nuevos
+            (comment_node, post_node, author_name).
+        :return: Lista de cambios registrados en esta versión.
+        """
+        self.version += 1
+        start = len(self.change_log)
+
+        if removed is not None:
+            removed_nodes = set(removed['Nodo'] if isinstance(removed, pd.DataFrame) else removed)
+            dropped = set()
+            for node in removed_nodes:
+                if node not in self.G:
+                    continue
+                # Los comentarios cuelgan de su publicación: sin ella no existirían en un rebuild
+                orphans = [
+                    v
+                    for v in self.G.successors(node)
+                    if self.G.nodes[v].get('tipo') == 'Comentario'
+                ]
+                for orphan in orphans:
+                    self._remove_node(orphan)
+                self._remove_node(node)
+                dropped.update(orphans)
+                dropped.add(node)
+            self.attrs.remove(dropped)
+            self.dataset = self.dataset[~self.dataset['Nodo'].isin(removed_nodes)]
+
+        if added is not None and len(added) > 0:
+            new_nodes = [n for n in added['Nodo'] if n not in self.G]
+            self.add_nodes(added)
+            for node in new_nodes:
+                self._log('add_node', node)
+            self.dataset = pd.concat([self.dataset, added], ignore_index=True)
+
+            # Aristas PUBLICA de las capturas nuevas y de capturas previas cuyo autor acaba de llegar
+            new_users = added.loc[added['Tipo_de_Nodo'] == 'Usuario', 'Autor']
+            capturas = self.dataset[self.dataset['Tipo_de_Nodo'] == 'Captura']
+            affected = capturas[
+                capturas['Nodo'].isin(added['Nodo']) | capturas['Autor'].isin(new_users)
+            ]
+            for u, v in self.add_edges(affected):
+                self._log('add_edge', u, v)
+
+            new_posts = set(
+                added.loc[
+                    (added['Tipo_de_Nodo'] == 'Captura') & (added['Plataforma'] == 'Facebook'),
+                    'Nodo',
+                ]
+            )
+            if new_posts:
+                for u, v in self.add_facebook_relationships(post_nodes=new_posts):
+                    self._log('add_node', v)
+                    self._log('add_edge', u, v)
+
+        if comments is not None:
+            for u, v in self.add_comments(comments):
+                self._log('add_node', v)
+                self._log('add_edge', u, v)
+
+        return self.change_log[start:]
+
+    def changes_since(self, version):
+        """
+        Devuelve los cambios registrados después de una versión dada.
+        """
+        return [change for change in self.change_log if change[0] > version]
+
+    def changed_nodes(self, version=0):
+        """
+        Nodos tocados (altas, bajas o extremos de aristas modificadas) después de una versión.
+        """
+        return {node for change in self.changes_since(version) for node in change[2:]}
 
     def save_graph(self, filepath):
+        """
+        Guarda el grafo en formato compacto: IDs de nodo una sola vez, aristas como pares de
+        enteros, tipos como categorías y los atributos alineados con el orden de los nodos.
+        """
+        nodes = list(self.G.nodes)
+        index = {node: i for i, node in enumerate(nodes)}
+        edges = list(self.G.edges(data='tipo'))
+        payload = {
+            'nodes': nodes,
+            'node_tipo': pd.Categorical([tipo for _, tipo in self.G.nodes(data='tipo')]),
+            'src': np.fromiter((index[u] for u, _, _ in edges), dtype=np.int32, count=len(edges)),
+            'dst': np.fromiter((index[v] for _, v, _ in edges), dtype=np.int32, count=len(edges)),
+            'edge_tipo': pd.Categorical([tipo for _, _, tipo in edges]),
+            'attrs': self.attrs.frame.reindex(nodes).reset_index(drop=True),
+            'version': self.version,
+        }
         with open(filepath, 'wb') as f:
-            pickle.dump(self.G, f)
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
         print(f'Grafo guardado en {filepath}')
 
     def load_graph(self, filepath):
         with open(filepath, 'rb') as f:
-            self.G = pickle.load(f)
+            payload = pickle.load(f)
+        if isinstance(payload, nx.Graph):
+            # Cache antiguo: los atributos venían dentro del grafo
+            self.G = payload
+            self.attrs = NodeAttributeStore.from_graph(self.G)
+            self._num_edges = self.G.number_of_edges()
+        else:
+            nodes = payload['nodes']
+            self.G = nx.DiGraph()
+            self.G.add_nodes_from(
+                (node, {'tipo': tipo}) if isinstance(tipo, str) else node
+                for node, tipo in zip(nodes, payload['node_tipo'])
+            )
+            self.G.add_edges_from(
+                (nodes[u], nodes[v], {'tipo': tipo})
+                for u, v, tipo in zip(payload['src'], payload['dst'], payload['edge_tipo'])
+            )
+            attrs = payload['attrs']
+            attrs.index = nodes
+            self.attrs = NodeAttributeStore(attrs[attrs['tipo'].notna()])
+            self.version = payload.get('version', 0)
+            self._num_edges = len(payload['src'])
         print(f'Grafo cargado desde {filepath}')
 
+    @property
+    def temporal_index(self):
+        """
+        Índice temporal de capturas y comentarios; se reconstruye solo si el almacén de
+        atributos cambió desde la última consulta.
+        """
+        key = (id(self.attrs), self.attrs.revision)
+        if self._temporal is None or self._temporal[0] != key:
+            self._temporal = (key, TemporalIndex(self.attrs))
+        return self._temporal[1]
+
+    def window(self, desde=None, hasta=None, include_context=True):
+        """
+        Vista del grafo limitada a las capturas/comentarios con fecha en [desde, hasta],
+        sin reconstruir la red.
+        """
+        return self.temporal_index.window(self.G, desde, hasta, include_context)
+
+    def window_stats(self, desde=None, hasta=None, include_context=True):
+        """
+        Estadísticas básicas de una ventana temporal calculadas sobre la vista.
+        """
+        view = self.window(desde, hasta, include_context)
+        nodes = self.temporal_index.window_nodes(desde, hasta)
+        tipos = self.attrs.column('tipo', nodes).value_counts()
+        return {
+            'num_nodes': view.number_of_nodes(),
+            'num_edges': view.number_of_edges(),
+            'density': nx.density(view),
+            'num_capturas': int(tipos.get('Captura', 0)),
+            'num_comentarios': int(tipos.get('Comentario', 0)),
+        }
+
+    def project_users(self, kind='co_comment', min_weight=1, top_k=None, max_item_degree=None):
+        """
+        Grafo usuario-usuario ponderado ('co_comment', 'co_hashtag' o 'mention') calculado
+        con productos de matrices dispersas. Ver UserProjector.project para los parámetros.
+        """
+        projector = UserProjector(self.G, self.attrs, arrays=GraphViews.of(self.G).arrays)
+        return projector.to_graph(
+            kind, min_weight=min_weight, top_k=top_k, max_item_degree=max_item_degree
+        )
+
+    def nodes_by_type(self, tipo):
+        return self.attrs.members(tipo=tipo)
+
+    def nodes_by_platform(self, plataforma, tipo=None):
+        return self.attrs.members(tipo=tipo, plataforma=plataforma)
+
     def get_network_stats(self):
+        # Contadores mantenidos durante la construcción: no se recorre el grafo
+        num_nodes = self.G.number_of_nodes()
+        possible = num_nodes * (num_nodes - 1)
         return {
-            'num_nodes': self.G.number_of_nodes(),
-            'num_edges': self.G.number_of_edges(),
-            'density': nx.density(self.G),
-            'num_users': len([n for n in self.G.nodes if self.G.nodes[n].get('tipo') == 'Usuario']),
-            'num_capturas': len(
-                [n for n in self.G.nodes if self.G.nodes[n].get('tipo') == 'Captura']
-            ),
+            'num_nodes': num_nodes,
+            'num_edges': self._num_edges,
+            'density': self._num_edges / possible if possible > 0 else 0,
+            'num_users': self.attrs.count(tipo='Usuario'),
+            'num_capturas': self.attrs.count(tipo='Captura'),
         }
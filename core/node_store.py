@@ -0,0 +1,181 @@
+# core/node_store.py
+from collections import defaultdict
+
+import pandas as pd
+
+
+class NodeAttributeStore:
+    """
+    Almacén columnar de atributos de nodos, indexado por el ID del nodo.
+    El grafo solo guarda el ID y el tipo de cada nodo; plataforma, estructura, autor,
+    fecha y contenido viven aquí como columnas (categóricas cuando es posible), lo que
+    permite filtrar de forma vectorizada sin recorrer los diccionarios del grafo.
+    Además mantiene índices (conjuntos de IDs) por tipo y por plataforma, actualizados en
+    cada alta o baja, para contar y seleccionar nodos en tiempo constante.
+    """
+
+    COLUMNS = ('tipo', 'plataforma', 'estructura', 'autor', 'autor_id', 'fecha', 'contenido')
+    CATEGORICAL = ('tipo', 'plataforma', 'estructura')
+
+    def __init__(self, frame=None):
+        self._frame = self._empty() if frame is None else frame
+        self._pending = []
+        # Se incrementa en cada modificación para invalidar estructuras derivadas
+        self.revision = 0
+        self._by_tipo = defaultdict(set)
+        self._by_plataforma = defaultdict(set)
+        self._index(self._frame)
+
+    @classmethod
+    def _empty(cls):
+        frame = pd.DataFrame({col: pd.Series(dtype=object) for col in cls.COLUMNS})
+        frame['fecha'] = pd.Series(dtype='datetime64[ns]')
+        return frame
+
+    @classmethod
+    def from_graph(cls, G, strip=True):
+        """
+        Construye el almacén a partir de los atributos guardados en un grafo (p. ej. un
+        pickle antiguo) y, opcionalmente, los elimina del grafo dejando solo 'tipo'.
+        """
+        records = {}
+        for node, data in G.nodes(data=True):
+            records[node] = {
+                'tipo': data.get('tipo'),
+                'plataforma': data.get('plataforma', data.get('Plataforma')),
+                'estructura': data.get('estructura'),
+                'autor': data.get('autor', data.get('username')),
+                'autor_id': data.get('autor_id'),
+                'fecha': data.get('fecha'),
+                'contenido': data.get('contenido'),
+            }
+            if strip:
+                tipo = data.get('tipo')
+                data.clear()
+                if tipo is not None:
+                    data['tipo'] = tipo
+        store = cls()
+        if records:
+            store.add(pd.DataFrame.from_dict(records, orient='index'))
+        return store
+
+    def add(self, frame):
+        """
+        Añade (o sobrescribe) filas de atributos. El índice del DataFrame son los IDs de nodo.
+        La consolidación se difiere hasta la siguiente lectura.
+        """
+        frame = frame[~frame.index.duplicated(keep='last')].reindex(columns=self.COLUMNS)
+        self._unindex([node for node in frame.index if self._known(node)])
+        self._index(frame)
+        self._pending.append(frame)
+        self.revision += 1
+
+    def remove(self, nodes):
+        nodes = list(nodes)
+        self._unindex(nodes)
+        frame = self.frame
+        self._frame = frame[~frame.index.isin(nodes)]
+        self.revision += 1
+
+    def _known(self, node):
+        return any(node in members for members in self._by_tipo.values())
+
+    def _index(self, frame):
+        for key, index in (('tipo', self._by_tipo), ('plataforma', self._by_plataforma)):
+            for value, nodes in frame.groupby(key, observed=True).groups.items():
+                index[value].update(nodes)
+
+    def _unindex(self, nodes):
+        for index in (self._by_tipo, self._by_plataforma):
+            for members in index.values():
+                members.difference_update(nodes)
+
+    def members(self, tipo=None, plataforma=None):
+        """
+        Conjunto de nodos de un tipo y/o plataforma, leído de los índices mantenidos.
+        Acepta un valor o una tupla de valores. El conjunto devuelto no debe modificarse.
+        """
+        selected = None
+        for value, index in ((tipo, self._by_tipo), (plataforma, self._by_plataforma)):
+            if value is None:
+                continue
+            if isinstance(value, str):
+                members = index.get(value, set())
+            else:
+                members = set().union(*(index.get(v, set()) for v in value))
+            selected = members if selected is None else selected & members
+        if selected is None:
+            return set().union(*self._by_tipo.values())
+        return selected
+
+    def count(self, tipo=None, plataforma=None):
+        """
+        Número de nodos de un tipo y/o plataforma (O(1) para un único filtro).
+        """
+        return len(self.members(tipo=tipo, plataforma=plataforma))
+
+    def platforms(self):
+        return [p for p, members in self._by_plataforma.items() if members]
+
+    @property
+    def frame(self):
+        if self._pending:
+            frame = pd.concat([self._frame] + self._pending)
+            frame = frame[~frame.index.duplicated(keep='last')]
+            # Normaliza fechas con y sin zona horaria (los timeStamp de Facebook traen +0000)
+            fecha = pd.to_datetime(frame['fecha'], errors='coerce', utc=True)
+            frame['fecha'] = fecha.dt.tz_localize(None)
+            for col in self.CATEGORICAL:
+                frame[col] = frame[col].astype('category')
+            self._frame = frame
+            self._pending = []
+        return self._frame
+
+    def __len__(self):
+        return len(self.frame)
+
+    def __contains__(self, node):
+        return node in self.frame.index
+
+    def get(self, node):
+        """
+        Devuelve los atributos de un nodo como diccionario (vacío si no existe).
+        """
+        if node not in self.frame.index:
+            return {}
+        return self.frame.loc[node].to_dict()
+
+    def column(self, name, nodes=None):
+        """
+        Devuelve una columna completa o restringida a una lista de nodos.
+        """
+        series = self.frame[name]
+        return series if nodes is None else series.reindex(nodes)
+
+    def mask(self, plataforma=None, tipo=None, desde=None, hasta=None):
+        """
+        Máscara booleana vectorizada sobre el almacén.
+        :param plataforma: Plataforma o lista de plataformas.
+        :param tipo: Tipo de nodo o lista de tipos.
+        :param desde: Fecha mínima (inclusive).
+        :param hasta: Fecha máxima (inclusive).
+        """
+        frame = self.frame
+        mask = pd.Series(True, index=frame.index)
+        if plataforma is not None:
+            values = [plataforma] if isinstance(plataforma, str) else list(plataforma)
+            mask &= frame['plataforma'].isin(values)
+        if tipo is not None:
+            values = [tipo] if isinstance(tipo, str) else list(tipo)
+            mask &= frame['tipo'].isin(values)
+        if desde is not None:
+            mask &= frame['fecha'] >= pd.Timestamp(desde)
+        if hasta is not None:
+            mask &= frame['fecha'] <= pd.Timestamp(hasta)
+        return mask
+
+    def nodes(self, **filters):
+        """
+        IDs de nodo que cumplen los filtros de `mask` (plataforma, tipo, desde, hasta).
+        """
+        return self.frame.index[self.mask(**filters).to_numpy()]
@@ -0,0 +1,131 @@
+# core/projection.py
+import networkx as nx
+import numpy as np
+import pandas as pd
+import scipy.sparse as sp
+
+from core.graph_arrays import GraphArrays
+
+
+class UserProjector:
+    """
+    Proyecciones usuario-usuario ponderadas calculadas como productos de matrices dispersas
+    sobre la matriz de incidencia, en lugar de recorrer vecinos en Python:
+    - co_comment: usuarios que comentan las mismas publicaciones.
+    - co_hashtag: autores que publican capturas con los mismos hashtags.
+    - mention: autor -> usuario mencionado en sus capturas (dirigida).
+    co_hashtag y mention necesitan aristas CONTIENE_HASHTAG y MENCIONA, que NetworkBuilder
+    todavía no genera.
+    """
+
+    KINDS = ('co_comment', 'co_hashtag', 'mention')
+
+    def __init__(self, G, attrs=None, arrays=None):
+        self.G = G
+        self.attrs = attrs
+        self.arrays = arrays if arrays is not None else GraphArrays(G)
+
+    def _require(self, tipo):
+        if tipo not in self.arrays.edge_tipo.categories:
+            raise ValueError(f'La proyección necesita aristas {tipo} y el grafo no tiene ninguna.')
+
+    def _comment_authors(self, comment_nodes):
+        """
+        Autor de cada comentario identificado por su ID de Facebook ('autor_id'), de modo
+        que dos autores con el mismo nombre no se fusionan. Solo los comentarios sin ID
+        (p. ej. añadidos a mano sin author_id) se identifican por el nombre.
+        """
+        if self.attrs is None:
+            data = [self.G.nodes[n] for n in comment_nodes]
+            return np.array([d.get('autor_id', d.get('autor')) for d in data], dtype=object)
+        names = self.attrs.column('autor', comment_nodes)
+        if 'autor_id' not in self.attrs.frame.columns:
+            return names.to_numpy()
+        ids = self.attrs.column('autor_id', comment_nodes)
+        return ids.where(ids.notna(), names).to_numpy()
+
+    def _co_comment(self):
+        posts, comments = self.arrays.edge_arrays('TIENE_COMENTARIO')
+        authors = self._comment_authors(self.arrays.nodes[comments])
+        codes, users = pd.factorize(authors)
+        valid = codes >= 0
+        B = self.arrays.incidence(codes[valid], posts[valid], shape=(len(users), len(self.arrays)))
+        return B, np.asarray(users, dtype=object)
+
+    def _authored(self, B):
+        rows = np.flatnonzero(B.getnnz(axis=1))
+        return B[rows], self.arrays.nodes[rows]
+
+    def _co_hashtag(self):
+        self._require('CONTIENE_HASHTAG')
+        publica = self.arrays.adjacency('PUBLICA')
+        hashtags = self.arrays.adjacency('CONTIENE_HASHTAG')
+        return self._authored(publica @ hashtags)
+
+    def project(self, kind='co_comment', min_weight=1, top_k=None, max_item_degree=None):
+        """
+        Calcula la proyección como matriz dispersa.
+        :param kind: 'co_comment', 'co_hashtag' o 'mention'.
+        :param min_weight: Peso mínimo para conservar una arista.
+        :param top_k: Cada usuario conserva sus k aristas de mayor peso. En las
+            co-ocurrencias una arista se mantiene si la conserva cualquiera de sus dos
+            extremos (unión de ambos sentidos), así que un usuario puede acabar con más
+            de k vecinos.
+        :param max_item_degree: Ignora publicaciones/hashtags compartidos por más usuarios
+            que este umbral (evita el bloque denso que genera un hub).
+        :return: (matriz CSR usuario x usuario, etiquetas de usuario). En co_comment las
+            etiquetas son los IDs de autor de los comentarios.
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f'Tipo de proyección desconocido: {kind}. Opciones: {self.KINDS}')
+
+        if kind == 'mention':
+            self._require('MENCIONA')
+            publica = self.arrays.adjacency('PUBLICA')
+            mentions = self.arrays.adjacency('MENCIONA')
+            W = (publica @ mentions).tocsr()
+            labels = self.arrays.nodes
+        else:
+            B, labels = self._co_comment() if kind == 'co_comment' else self._co_hashtag()
+            B = (B > 0).astype(np.float64) if kind == 'co_hashtag' else B
+            if max_item_degree is not None:
+                item_degree = B.getnnz(axis=0)
+                B = B @ sp.diags((item_degree <= max_item_degree).astype(np.float64))
+            W = (B @ B.T).tocsr()
+            W.setdiag(0)
+
+        W.data[W.data < min_weight] = 0
+        W.eliminate_zeros()
+        if top_k is not None:
+            W = _top_k_per_row(W, top_k)
+            if kind != 'mention':
+                W = W.maximum(W.T).tocsr()
+        return W, labels
+
+    def to_graph(self, kind='co_comment', **kwargs):
+        """
+        Igual que `project`, pero devuelve un grafo de networkx con atributo 'weight'
+        (Graph para las co-ocurrencias, DiGraph para las menciones).
+        """
+        W, labels = self.project(kind, **kwargs)
+        P = nx.DiGraph() if kind == 'mention' else nx.Graph()
+        coo = sp.triu(W).tocoo() if kind != 'mention' else W.tocoo()
+        P.add_weighted_edges_from(
+            zip(labels[coo.row], labels[coo.col], coo.data.tolist()), weight='weight'
+        )
+        return P
+
+
+def _top_k_per_row(W, k):
+    """
+    Conserva en cada fila de una matriz CSR solo las k entradas de mayor valor.
+    """
+    W = W.tocsr(copy=True)
+    row_nnz = np.diff(W.indptr)
+    for row in np.flatnonzero(row_nnz > k):
+        start, end = W.indptr[row], W.indptr[row + 1]
+        values = W.data[start:end]
+        drop = np.argpartition(values, -k)[:-k]
+        values[drop] = 0
+    W.eliminate_zeros()
+    return W
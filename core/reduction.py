@@ -0,0 +1,94 @@
+# core/reduction.py
+import numpy as np
+import scipy.sparse as sp
+
+
+class GraphReduction:
+    """
+    Reducción de un grafo no dirigido (matriz CSR simétrica) colapsando hojas: cada nodo
+    de grado 1 se funde con su único vecino. En modo 'core' el pelado se repite hasta que
+    no quedan hojas, de modo que los árboles colgantes se funden en el nodo del 2-core
+    (o la raíz) al que cuelgan.
+    La matriz reducida es Pᵀ A P (P = asignación nodo -> representante): las aristas
+    absorbidas quedan como lazos (2w en la diagonal), así que grados y modularidad de
+    cualquier partición en la que cada hoja acompañe a su representante se conservan.
+    En modo 'core' una componente que sea un árbol se funde entera en un solo nodo, así
+    que ese modo solo conviene cuando la estructura de interés vive en el 2-core.
+    """
+
+    MODES = ('leaves', 'core')
+
+    def __init__(self, A, mode='leaves'):
+        """
+        :param A: Matriz CSR simétrica (ponderada o no; lazos como 2w en la diagonal).
+        :param mode: 'leaves' (una pasada) o 'core' (pelado iterativo hasta el 2-core).
+        """
+        if mode not in self.MODES:
+            raise ValueError(f'Modo de reducción no soportado: {mode}')
+        A = sp.csr_matrix(A, dtype=np.float64)
+        n = A.shape[0]
+        self.mode = mode
+
+        pattern = A.copy()
+        pattern.setdiag(0)
+        pattern.eliminate_zeros()
+        coo = pattern.tocoo()
+        degree = np.bincount(coo.row, minlength=n)
+
+        parent = np.arange(n)
+        alive = np.ones(n, dtype=bool)
+        self.rounds = 0
+        while True:
+            leaf = alive & (degree == 1)
+            if not leaf.any():
+                break
+            edge = leaf[coo.row] & alive[coo.col]
+            rows, cols = coo.row[edge], coo.col[edge]
+            # Dos hojas unidas entre sí (par aislado): se conserva la de menor índice
+            keep = leaf[cols] & (cols > rows)
+            rows, cols = rows[~keep], cols[~keep]
+            parent[rows] = cols
+            alive[rows] = False
+            degree[rows] = 0
+            degree -= np.bincount(cols, minlength=n)
+            self.rounds += 1
+            if mode == 'leaves':
+                break
+
+        # Cada nodo apunta a su representante final (saltos de puntero)
+        while True:
+            grandparent = parent[parent]
+            if np.array_equal(grandparent, parent):
+                break
+            parent = grandparent
+
+        self.kept = np.flatnonzero(alive)
+        position = np.full(n, -1, dtype=np.int64)
+        position[self.kept] = np.arange(len(self.kept))
+        self.position = position[parent]
+        P = sp.csr_matrix((np.ones(n), (np.arange(n), self.position)), shape=(n, len(self.kept)))
+        self.matrix = (P.T @ A @ P).tocsr()
+        # Número de nodos originales que representa cada nodo reducido
+        self.weight = np.bincount(self.position, minlength=len(self.kept))
+
+    def __len__(self):
+        return len(self.kept)
+
+    def reduce(self, values):
+        """
+        Lleva un arreglo por nodo original al grafo reducido (valor del representante).
+        """
+        return np.asarray(values)[self.kept]
+
+    def expand(self, values):
+        """
+        Expande un arreglo por nodo reducido a los nodos originales (cada nodo colapsado
+        recibe el valor de su representante, p. ej. su comunidad).
+        """
+        return np.asarray(values)[self.position]
+
+    def reduce_nodes(self, nodes):
+        """
+        Representantes (índices reducidos, sin repetir) de una lista de índices originales.
+        """
+        return np.unique(self.position[np.asarray(nodes, dtype=np.int64)])
@@ -0,0 +1,53 @@
+# core/temporal_index.py
+import numpy as np
+import pandas as pd
+
+
+class TemporalIndex:
+    """
+    Índice temporal de capturas y comentarios ordenado por fecha.
+    Una ventana [desde, hasta] se resuelve con dos búsquedas binarias y devuelve un corte
+    del arreglo ordenado (sin copia); el subgrafo correspondiente es una vista de networkx.
+    """
+
+    TIPOS = ('Captura', 'Comentario')
+
+    def __init__(self, attrs):
+        frame = attrs.frame
+        frame = frame[frame['tipo'].isin(self.TIPOS) & frame['fecha'].notna()]
+        frame = frame.sort_values('fecha', kind='stable')
+        self.fechas = frame['fecha'].to_numpy()
+        self.nodes = frame.index.to_numpy()
+
+    def __len__(self):
+        return len(self.nodes)
+
+    def _bounds(self, desde=None, hasta=None):
+        start = 0 if desde is None else np.searchsorted(self.fechas, self._ts(desde), 'left')
+        end = len(self.fechas)
+        if hasta is not None:
+            end = np.searchsorted(self.fechas, self._ts(hasta), 'right')
+        return start, end
+
+    def _ts(self, value):
+        return pd.Timestamp(value).to_datetime64().astype(self.fechas.dtype)
+
+    def window_nodes(self, desde=None, hasta=None):
+        """
+        Nodos con fecha en [desde, hasta] (ambos inclusive), como vista del arreglo ordenado.
+        """
+        start, end = self._bounds(desde, hasta)
+        return self.nodes[start:end]
+
+    def window(self, G, desde=None, hasta=None, include_context=True):
+        """
+        Vista (sin copia) del grafo restringida a una ventana temporal.
+        :param G: Grafo completo.
+        :param include_context: Si es True, incluye también los predecesores de los nodos de
+            la ventana (autores de las capturas y publicaciones de los comentarios).
+        """
+        nodes = self.window_nodes(desde, hasta)
+        if include_context:
+            context = {pred for node in nodes for pred in G.predecessors(node)}
+            nodes = context.union(nodes)
+        return G.subgraph(nodes)
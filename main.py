@@ -58,13 +58,13 @@ if __name__ == '__main__':
     plot_network(builder.G)
 
     # 5. Análisis Básico de Métricas de Red
-    analyzer = BasicAnalyzer(builder.G)
+    analyzer = BasicAnalyzer(builder.G, attrs=builder.attrs)
     basic_metrics = analyzer.summarize()
     print('\nMétricas Básicas de la Red:')
     print(basic_metrics)
 
     # 6. Análisis Profundo de Métricas de Redes
-    deep_analyzer = DeepAnalyzer(builder.G)
+    deep_analyzer = DeepAnalyzer(builder.G, attrs=builder.attrs)
     deep_metrics = deep_analyzer.analyze(dataset)
     print('\nAnálisis Profundo:')
     print(deep_metrics)
@@ -0,0 +1,82 @@
+# utils/compact_export.py
+import json
+import os
+
+import numpy as np
+
+
+def _write_array(filename, values, dtype, chunksize):
+    values = np.asarray(values)
+    out = np.lib.format.open_memmap(filename, mode='w+', dtype=dtype, shape=values.shape)
+    for start in range(0, len(values), chunksize):
+        out[start : start + chunksize] = values[start : start + chunksize]
+    out.flush()
+    del out
+
+
+def write_compact(path, nodes, communities=None, centralities=None, chunksize=100000):
+    """
+    Exporta resultados en formato compacto dentro de un directorio:
+    - nodes.jsonl: un ID de nodo por línea (JSON, conserva si es texto o número).
+    - community.npy: comunidad de cada nodo (int32, -1 si no tiene).
+    - centrality_<medida>.npy: valor de cada medida (float32).
+    - meta.json: tamaños y medidas disponibles.
+    Todo se escribe por bloques y los .npy se pueden abrir con memory-map.
+    :param nodes: Secuencia de IDs de nodo (define el orden de los arreglos).
+    :param communities: Arreglo nodo -> comunidad alineado con nodes.
+    :param centralities: Diccionario medida -> arreglo alineado con nodes.
+    """
+    os.makedirs(path, exist_ok=True)
+    num_nodes = len(nodes)
+    with open(os.path.join(path, 'nodes.jsonl'), 'w', encoding='utf-8') as f:
+        for start in range(0, num_nodes, chunksize):
+            chunk = nodes[start : start + chunksize]
+            f.write(''.join(json.dumps(node, ensure_ascii=False) + '\n' for node in chunk))
+
+    meta = {'num_nodes': num_nodes, 'measures': [], 'num_communities': 0}
+    if communities is not None:
+        _write_array(os.path.join(path, 'community.npy'), communities, np.int32, chunksize)
+        meta['num_communities'] = int(np.max(communities)) + 1 if num_nodes else 0
+    for measure, values in (centralities or {}).items():
+        _write_array(os.path.join(path, f'centrality_{measure}.npy'), values, np.float32, chunksize)
+        meta['measures'].append(measure)
+
+    with open(os.path.join(path, 'meta.json'), 'w') as f:
+        json.dump(meta, f)
+
+
+def iter_nodes(path):
+    """
+    Recorre los IDs de nodo de una exportación compacta sin cargarlos todos en memoria.
+    """
+    with open(os.path.join(path, 'nodes.jsonl'), encoding='utf-8') as f:
+        for line in f:
+            yield json.loads(line)
+
+
+def load_compact(path, mmap=True, load_nodes=True):
+    """
+    Carga una exportación de write_compact.
+    :param mmap: Abre los arreglos con memory-map (solo lectura) en lugar de leerlos.
+    :param load_nodes: Si es False, no lee los IDs (usar iter_nodes para recorrerlos).
+    :return: Diccionario con 'nodes', 'community', 'centrality' (medida -> arreglo) y 'meta'.
+    """
+    with open(os.path.join(path, 'meta.json')) as f:
+        meta = json.load(f)
+    mmap_mode = 'r' if mmap else None
+
+    community = None
+    community_path = os.path.join(path, 'community.npy')
+    if os.path.exists(community_path):
+        community = np.load(community_path, mmap_mode=mmap_mode)
+
+    centrality = {
+        measure: np.load(os.path.join(path, f'centrality_{measure}.npy'), mmap_mode=mmap_mode)
+        for measure in meta['measures']
+    }
+    return {
+        'nodes': list(iter_nodes(path)) if load_nodes else None,
+        'community': community,
+        'centrality': centrality,
+        'meta': meta,
+    }
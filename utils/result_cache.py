@@ -0,0 +1,89 @@
+# utils/result_cache.py
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+
+
+class ResultCache:
+    """
+    Cache en disco de resultados de análisis, direccionado por contenido: la clave es un
+    hash de la huella del grafo, el nombre del algoritmo y sus parámetros. Si el grafo no
+    cambió, repetir un análisis devuelve el resultado guardado. Cuando el directorio supera
+    `max_bytes` se eliminan las entradas usadas hace más tiempo.
+    """
+
+    def __init__(self, directory='.analysis_cache', max_bytes=512 * 1024**2):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(fingerprint, name, params=None):
+        payload = json.dumps(
+            {'graph': fingerprint, 'name': name, 'params': params or {}},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f'{key}.pkl')
+
+    def get(self, key):
+        """
+        :return: (encontrado, valor)
+        """
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                value = pickle.load(f)
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        # La fecha de modificación sirve como marca de último uso para el desalojo
+        os.utime(path)
+        return True, value
+
+    def put(self, key, value):
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as f:
+            pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+
+    def cached(self, fingerprint, name, params, compute):
+        """
+        Devuelve el resultado guardado para (grafo, algoritmo, parámetros) o lo calcula con
+        `compute()` y lo guarda.
+        """
+        key = self.key(fingerprint, name, params)
+        found, value = self.get(key)
+        if found:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def size(self):
+        return sum(os.path.getsize(path) for path, _ in self._entries())
+
+    def _entries(self):
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith('.pkl'):
+                entries.append((entry.path, entry.stat().st_mtime))
+        return entries
+
+    def _evict(self):
+        entries = sorted(self._entries(), key=lambda item: item[1])
+        total = sum(os.path.getsize(path) for path, _ in entries)
+        for path, _ in entries:
+            if total <= self.max_bytes:
+                break
+            total -= os.path.getsize(path)
+            os.remove(path)
+
+    def clear(self):
+        for path, _ in self._entries():
+            os.remove(path)
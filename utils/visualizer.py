@@ -1,5 +1,14 @@
+import hashlib
+import os
+import pickle
+
 import matplotlib.pyplot as plt
 import networkx as nx
+import numpy as np
+from matplotlib.collections import LineCollection
+
+# Layouts ya calculados, indexados por el hash de los nodos y aristas dibujados
+_LAYOUT_CACHE = {}
 
 
 def plot_network(G, fraction=0.005):
@@ -86,4 +95,114 @@ def plot_network(G, fraction=0.005):
     table.scale(1, 1.5)
 
     # Mostrar la gráfica
-    plt.show()
\ No newline at end of file
+    plt.show()
+
+
+def _layout_key(H):
+    digest = hashlib.sha256()
+    digest.update(repr(sorted(map(repr, H.nodes))).encode('utf-8'))
+    digest.update(repr(sorted(map(repr, H.edges))).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def cached_layout(H, cache_path=None, seed=42):
+    """
+    Spring layout memorizado en memoria (y opcionalmente en disco, en `cache_path`) para
+    no recalcularlo al volver a graficar el mismo subgrafo.
+    """
+    key = _layout_key(H)
+    if key in _LAYOUT_CACHE:
+        return _LAYOUT_CACHE[key]
+
+    stored = {}
+    if cache_path and os.path.exists(cache_path):
+        with open(cache_path, 'rb') as f:
+            stored = pickle.load(f)
+    if key not in stored:
+        stored[key] = nx.spring_layout(H, seed=seed, iterations=50)
+        if cache_path:
+            with open(cache_path, 'wb') as f:
+                pickle.dump(stored, f)
+    _LAYOUT_CACHE[key] = stored[key]
+    return stored[key]
+
+
+def aggregate_by_degree(H, node_budget):
+    """
+    Reduce un grafo a los `node_budget` nodos de mayor grado. Cada nodo descartado se
+    absorbe en su vecino conservado de mayor grado (o en el representante de un vecino).
+    :return: (grafo agregado, diccionario nodo conservado -> número de nodos que representa)
+    """
+    if H.number_of_nodes() <= node_budget:
+        return H, dict.fromkeys(H.nodes, 1)
+
+    degree = dict(H.degree())
+    kept = set(sorted(degree, key=degree.get, reverse=True)[:node_budget])
+    representative = {node: node for node in kept}
+    pending = [node for node in H.nodes if node not in kept]
+    # Se propaga desde los nodos conservados hacia afuera hasta que nadie cambia
+    while pending:
+        remaining = []
+        for node in pending:
+            candidates = [representative[u] for u in H.neighbors(node) if u in representative]
+            if candidates:
+                representative[node] = max(candidates, key=degree.get)
+            else:
+                remaining.append(node)
+        if len(remaining) == len(pending):
+            break
+        pending = remaining
+
+    weight = dict.fromkeys(kept, 0)
+    for rep in representative.values():
+        weight[rep] += 1
+
+    aggregated = nx.Graph()
+    aggregated.add_nodes_from(kept)
+    aggregated.add_edges_from(
+        (representative[u], representative[v])
+        for u, v in H.edges
+        if u in representative and v in representative and representative[u] != representative[v]
+    )
+    return aggregated, weight
+
+
+def plot_community(
+    G, nodes, title='Comunidad', node_budget=300, label_budget=20, layout_cache_path=None
+):
+    """
+    Grafica una comunidad grande en segundos: agrega nodos por grado por encima de
+    `node_budget`, reutiliza layouts calculados, dibuja aristas y nodos en lote
+    (LineCollection / scatter) y solo etiqueta los `label_budget` nodos de mayor grado.
+    """
+    subgraph = G.subgraph(nodes)
+    H = subgraph.to_undirected(as_view=True) if subgraph.is_directed() else subgraph
+    H, weight = aggregate_by_degree(H, node_budget)
+    if H.number_of_nodes() == 0:
+        print('La comunidad no tiene nodos para graficar.')
+        return
+
+    pos = cached_layout(H, cache_path=layout_cache_path)
+    order = list(H.nodes)
+    coords = np.array([pos[node] for node in order])
+    index = {node: i for i, node in enumerate(order)}
+
+    _, ax = plt.subplots(figsize=(10, 8))
+    if H.number_of_edges():
+        segments = np.array([[coords[index[u]], coords[index[v]]] for u, v in H.edges])
+        ax.add_collection(LineCollection(segments, colors='gray', linewidths=0.4, alpha=0.5))
+
+    sizes = 20 + 30 * np.log1p([weight.get(node, 1) for node in order])
+    colors = ['red' if G.nodes[node].get('tipo') == 'Usuario' else 'lightblue' for node in order]
+    ax.scatter(coords[:, 0], coords[:, 1], s=sizes, c=colors, edgecolors='none', zorder=2)
+
+    degree = dict(H.degree())
+    for node in sorted(order, key=degree.get, reverse=True)[:label_budget]:
+        x, y = coords[index[node]]
+        ax.annotate(str(node), (x, y), fontsize=6, ha='center', va='bottom')
+
+    shown = H.number_of_nodes()
+    ax.set_title(f'{title}\nNodos: {len(subgraph)} (mostrados: {shown})')
+    ax.autoscale()
+    ax.set_axis_off()
+    plt.show()